@@ -1,6 +1,7 @@
 from flask import Flask, request, send_file, jsonify, send_from_directory
+from werkzeug.utils import secure_filename
 from flask_cors import CORS
-from groq import Groq
+from groq import Groq, AsyncGroq
 from docx import Document
 from docx.shared import Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
@@ -10,13 +11,25 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
 from reportlab.lib.enums import TA_LEFT, TA_CENTER
 from reportlab.lib.colors import HexColor
+from rate_limit import RateLimiter, RedisBucketStore, FairQueue, client_identity, rate_limit_error
+from similarity_cache import SimilarityCache
+from skills_engine import SkillsEngine
+from structured_output import StructuredOutput, StructuredOutputError
+from token_budget import count_tokens, truncate_to_tokens, TokenUsage
+from job_journal import JobJournal, job_key
+from text_normalizer import collapse_whitespace, clean_response, docx_paragraphs
+from contextvars import ContextVar
 import os
+import functools
+import asyncio
 import traceback
 import logging
 import time
 import uuid
 import re
 import json
+import gzip
+import hashlib
 
 app = Flask(__name__)
 
@@ -32,16 +45,18 @@ CORS(app, resources={
     r"/*": {
         "origins": "*",
         "methods": ["GET", "POST", "OPTIONS"],
-        "allow_headers": ["Content-Type"]
+        "allow_headers": ["Content-Type", "X-API-Key", "Idempotency-Key", "If-None-Match", "Range", "If-Range"],
+        "expose_headers": ["Retry-After", "ETag", "Content-Range"]
     }
 })
 
 # Groq API Configuration
-GROQ_API_KEY = " "
+GROQ_API_KEY = os.environ.get("GROQ_API_KEY", "").strip()
 GROQ_MODEL = "meta-llama/llama-4-scout-17b-16e-instruct"
 
-# Initialize Groq client
+# Initialize Groq clients
 client = None
+async_client = None
 if GROQ_API_KEY:
     try:
         client = Groq(api_key=GROQ_API_KEY)
@@ -51,12 +66,73 @@ if GROQ_API_KEY:
             max_tokens=5
         )
         logger.info(f"Groq API connected successfully with model: {GROQ_MODEL}")
+        # Non-blocking client for the ASGI serving mode (see asgi.py)
+        async_client = AsyncGroq(api_key=GROQ_API_KEY)
     except Exception as e:
         logger.error(f"Groq API connection failed: {e}")
         client = None
 else:
     logger.error("No GROQ_API_KEY found")
 
+# Rate limiting & fair queuing configuration
+RATE_LIMIT_RATE = float(os.environ.get("RATE_LIMIT_RATE", "0.5"))      # tokens refilled per second (0 disables)
+RATE_LIMIT_BURST = float(os.environ.get("RATE_LIMIT_BURST", "10"))     # bucket capacity
+RATE_LIMIT_REDIS_URL = os.environ.get("RATE_LIMIT_REDIS_URL")          # shared buckets for multi-worker deployments
+TRUSTED_PROXIES = int(os.environ.get("TRUSTED_PROXIES", "0"))          # reverse proxies in front of the app
+API_KEYS = frozenset(k.strip() for k in os.environ.get("API_KEYS", "").split(",") if k.strip())  # keys with their own bucket
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", "8"))  # concurrent Groq calls per worker
+CLIENT_WEIGHTS = json.loads(os.environ.get("CLIENT_WEIGHTS", "{}"))    # fair-queue weights by client id (key:<sha16> or ip:<addr>)
+
+# Token cost per request; /generate_resume makes up to five LLM calls
+ENDPOINT_COSTS = {
+    "enhance": 1,
+    "generate_resume": 5,
+}
+
+rate_limiter = RateLimiter(
+    RATE_LIMIT_RATE,
+    RATE_LIMIT_BURST,
+    RedisBucketStore(RATE_LIMIT_REDIS_URL) if RATE_LIMIT_REDIS_URL else None
+)
+llm_queue = FairQueue(LLM_MAX_CONCURRENCY, CLIENT_WEIGHTS)
+
+# Client making the current request, used to order LLM calls in the fair queue
+current_client = ContextVar("current_client", default="anonymous")
+
+# Near-duplicate enhancement cache (optional)
+SIMILARITY_CACHE_ENABLED = os.environ.get("SIMILARITY_CACHE_ENABLED", "0") == "1"
+SIMILARITY_THRESHOLD = float(os.environ.get("SIMILARITY_THRESHOLD", "0.85"))
+SIMILARITY_CACHE_SIZE = int(os.environ.get("SIMILARITY_CACHE_SIZE", "5000"))
+
+enhancement_cache = SimilarityCache(SIMILARITY_THRESHOLD, SIMILARITY_CACHE_SIZE) if SIMILARITY_CACHE_ENABLED else None
+
+# Local skills normalization; falls back to the LLM below this confidence
+SKILLS_FAST_PATH_ENABLED = os.environ.get("SKILLS_FAST_PATH_ENABLED", "1") == "1"
+SKILLS_MIN_CONFIDENCE = float(os.environ.get("SKILLS_MIN_CONFIDENCE", "0.7"))
+
+skills_engine = SkillsEngine(SKILLS_MIN_CONFIDENCE) if SKILLS_FAST_PATH_ENABLED else None
+
+# Ask the model for schema-constrained JSON instead of free text
+STRUCTURED_OUTPUT_ENABLED = os.environ.get("STRUCTURED_OUTPUT_ENABLED", "0") == "1"
+
+structured_output = StructuredOutput() if STRUCTURED_OUTPUT_ENABLED else None
+
+# Checkpoint journal so retried /generate_resume jobs skip finished stages
+JOURNAL_ENABLED = os.environ.get("JOURNAL_ENABLED", "1") == "1"
+JOURNAL_PATH = os.environ.get("JOURNAL_PATH", os.path.join("generated", "jobs.db"))
+JOURNAL_RETENTION_DAYS = float(os.environ.get("JOURNAL_RETENTION_DAYS", "7"))
+
+journal = None
+if JOURNAL_ENABLED:
+    try:
+        os.makedirs(os.path.dirname(JOURNAL_PATH) or ".", exist_ok=True)
+        journal = JobJournal(JOURNAL_PATH)
+        pruned = journal.prune(JOURNAL_RETENTION_DAYS * 86400)
+        logger.info(f"Job journal ready at {JOURNAL_PATH} ({pruned} expired entries pruned)")
+    except Exception as e:
+        logger.error(f"Job journal unavailable: {e}")
+        journal = None
+
 # Resume Enhancement Prompts
 GLOBAL_RULES = [
     "Use a professional, employer-focused tone.",
@@ -236,12 +312,47 @@ resume_prompts = {
 
 }
 
+# Input token budget per section (measured with the local tokenizer)
+SECTION_TOKEN_BUDGETS = {
+    "summary": 400,
+    "experience": 1200,
+    "skills": 300,
+    "education": 500,
+    "projects": 1200,
+}
+DEFAULT_TOKEN_BUDGET = 750
+
+SYSTEM_MESSAGE = (
+    "You are an expert resume consultant. Follow the instructions precisely and return ONLY "
+    "the enhanced content without any preambles, explanations, or meta-commentary."
+)
+
+_DECORATIVE_EMOJI = re.compile(r'[\U0001F300-\U0001FAFF\u2600-\u27BF]\uFE0F?\s*')
 
-def sanitize_input(text, max_chars=3000):
-    """Clean and limit input text."""
+
+def build_system_prompt(section_name):
+    """Static instructions for a section, sent first so provider prefix caching can reuse them."""
+    template = _DECORATIVE_EMOJI.sub('', resume_prompts[section_name])
+    parts = [SYSTEM_MESSAGE, GLOBAL_RULE.strip(), template]
+    if structured_output:
+        parts.append(structured_output.instructions(section_name))
+    return "\n\n".join(parts)
+
+
+# Precomputed once; byte-identical across calls for the same section
+SYSTEM_PROMPTS = {name: build_system_prompt(name) for name in resume_prompts}
+
+# Provider-reported prompt/completion tokens across all calls
+token_usage = TokenUsage()
+
+
+def sanitize_input(text, max_chars=3000, max_tokens=None):
+    """Clean and limit input text (to max_tokens when given, else max_chars)."""
     if not text:
         return ""
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = collapse_whitespace(text)
+    if max_tokens is not None:
+        return truncate_to_tokens(text, max_tokens)
     if len(text) > max_chars:
         text = text[:max_chars].rsplit(' ', 1)[0]
     return text
@@ -249,33 +360,11 @@ def sanitize_input(text, max_chars=3000):
 
 def clean_ai_response(text):
     """Remove common AI response artifacts."""
-    if not text:
-        return ""
-
-    # Remove code fences
-    text = re.sub(r'^```(?:\w+)?\s*|```$', '', text, flags=re.MULTILINE).strip()
+    return clean_response(text)
 
-    # Remove common preambles
-    patterns = [
-        r'^(?:Here\'s|Here is|Enhanced version:|Enhanced:|Sure,?.*?:)\s*',
-        r'^(?:Certainly|Of course|Absolutely).*?:\s*',
-        r'^\*\*.*?\*\*\s*',  # Remove markdown bold headers
-    ]
-    for pattern in patterns:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE | re.MULTILINE)
-
-    # Remove quotes
-    text = re.sub(r'^["\']|["\']$', '', text.strip())
-
-    return text.strip()
-
-
-def enhance_section(section_name, content, max_retries=2):
-    """Enhance a resume section using Groq AI with your specific prompts."""
-    if not client:
-        logger.error("Groq client not available")
-        return content
 
+def prepare_section(section_name, content):
+    """Normalize the section name and content; return (section_name, content, user_prompt)."""
     section_name = section_name.lower().strip()
 
     # Handle projects - parse JSON if provided
@@ -292,52 +381,162 @@ def enhance_section(section_name, content, max_retries=2):
         except (json.JSONDecodeError, TypeError):
             pass
 
-    # Sanitize input
-    content = sanitize_input(content)
+    # Sanitize input and trim it to the section's token budget
+    content = sanitize_input(content, max_tokens=SECTION_TOKEN_BUDGETS.get(section_name, DEFAULT_TOKEN_BUDGET))
+    if not content:
+        return section_name, "", None
+
+    # Only the user input varies per call; instructions live in the system prompt
+    user_prompt = f"User Input:\n{content}\n\nEnhanced Content:"
+    return section_name, content, user_prompt
+
+
+def completion_request(section_name, user_prompt):
+    """Keyword arguments for a chat completion call, shared by the sync and async clients."""
+    request_kwargs = dict(
+        model=GROQ_MODEL,
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPTS.get(section_name, SYSTEM_PROMPTS["summary"])},
+            {"role": "user", "content": user_prompt}
+        ],
+        temperature=0.5,
+        max_tokens=1024,
+        top_p=0.95
+    )
+    if structured_output:
+        request_kwargs.update(structured_output.request_options())
+    return request_kwargs
+
+
+def repair_request(section_name, response, error):
+    """Keyword arguments for a targeted structured-output repair call."""
+    return dict(
+        model=GROQ_MODEL,
+        messages=structured_output.repair_request(section_name, response, str(error)),
+        temperature=0,
+        max_tokens=1024,
+        **structured_output.request_options()
+    )
+
+
+def extract_enhanced(section_name, response):
+    """Pull the cleaned text out of a completion response."""
+    if structured_output:
+        return structured_output.decode(section_name, response)
+
+    enhanced = response.choices[0].message.content.strip()
+    enhanced = clean_ai_response(enhanced)
+    if not enhanced:
+        raise ValueError("Empty response from AI")
+    return enhanced
+
+
+def local_enhancement(section_name, content):
+    """Enhance without the LLM when a local engine is confident enough, else None."""
+    if skills_engine and section_name.lower().strip() == "skills":
+        enhanced = skills_engine.enhance(content)
+        if enhanced:
+            logger.info(f"Enhanced skills locally ({len(enhanced)} chars)")
+        return enhanced
+    return None
+
+
+def enhance_section(section_name, content, max_retries=2, try_local=True):
+    """Enhance a resume section using Groq AI with your specific prompts."""
+    local = local_enhancement(section_name, content) if try_local else None
+    if local:
+        return local
+
+    if not client:
+        logger.error("Groq client not available")
+        return content
+
+    section_name, content, user_prompt = prepare_section(section_name, content)
     if not content:
         logger.warning(f"Empty content for section: {section_name}")
         return ""
 
-    # Get the detailed prompt
-    prompt_template = resume_prompts.get(section_name, resume_prompts["summary"])
-
-    # Construct full prompt with global rules
-    full_prompt = (
-        f"{GLOBAL_RULE}\n\n"
-        f"{prompt_template}\n\n"
-        f"User Input:\n{content}\n\n"
-        f"Enhanced Content:"
-    )
+    cached = enhancement_cache.lookup(section_name, content) if enhancement_cache else None
+    if cached:
+        logger.info(f"Reusing near-duplicate enhancement for {section_name}")
+        return cached
 
     # Retry logic with exponential backoff
     for attempt in range(max_retries + 1):
         try:
             logger.info(f"Enhancing {section_name} (attempt {attempt + 1}/{max_retries + 1})")
 
-            response = client.chat.completions.create(
-                model=GROQ_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert resume consultant. Follow the instructions precisely and return ONLY the enhanced content without any preambles, explanations, or meta-commentary."
-                    },
-                    {
-                        "role": "user",
-                        "content": full_prompt
-                    }
-                ],
-                temperature=0.5,
-                max_tokens=1024,
-                top_p=0.95
-            )
+            with llm_queue.slot(current_client.get()):
+                response = client.chat.completions.create(**completion_request(section_name, user_prompt))
+            prompt_tokens, completion_tokens = token_usage.record(response)
+            try:
+                enhanced = extract_enhanced(section_name, response)
+            except StructuredOutputError as e:
+                # Fix just the broken reply rather than paying for a full retry
+                logger.warning(f"Repairing structured output for {section_name}: {e}")
+                with llm_queue.slot(current_client.get()):
+                    repair = client.chat.completions.create(**repair_request(section_name, response, e))
+                token_usage.record(repair)
+                enhanced = structured_output.decode_repair(section_name, response, repair)
+            if enhancement_cache:
+                enhancement_cache.add(section_name, content, enhanced)
+
+            logger.info(f"Successfully enhanced {section_name} ({len(enhanced)} chars, "
+                        f"{prompt_tokens} prompt + {completion_tokens} completion tokens)")
+            return enhanced
+
+        except Exception as e:
+            logger.error(f"Enhancement failed (attempt {attempt + 1}): {str(e)}")
+            if attempt >= max_retries:
+                logger.warning(f"Max retries reached, returning original content for {section_name}")
+                return content
+            time.sleep(1 * (2 ** attempt))
+
+    return content
+
+
+async def enhance_section_async(section_name, content, max_retries=2, try_local=True):
+    """Async counterpart of enhance_section; awaits the LLM instead of blocking a thread."""
+    local = local_enhancement(section_name, content) if try_local else None
+    if local:
+        return local
 
-            enhanced = response.choices[0].message.content.strip()
-            enhanced = clean_ai_response(enhanced)
+    if not async_client:
+        logger.error("Async Groq client not available")
+        return content
+
+    section_name, content, user_prompt = prepare_section(section_name, content)
+    if not content:
+        logger.warning(f"Empty content for section: {section_name}")
+        return ""
 
-            if not enhanced:
-                raise ValueError("Empty response from AI")
+    # MinHash signatures are pure Python; keep them off the event loop
+    cached = await asyncio.to_thread(enhancement_cache.lookup, section_name, content) if enhancement_cache else None
+    if cached:
+        logger.info(f"Reusing near-duplicate enhancement for {section_name}")
+        return cached
 
-            logger.info(f"Successfully enhanced {section_name} ({len(enhanced)} chars)")
+    for attempt in range(max_retries + 1):
+        try:
+            logger.info(f"Enhancing {section_name} async (attempt {attempt + 1}/{max_retries + 1})")
+
+            async with llm_queue.slot_async(current_client.get()):
+                response = await async_client.chat.completions.create(**completion_request(section_name, user_prompt))
+            prompt_tokens, completion_tokens = token_usage.record(response)
+            try:
+                enhanced = extract_enhanced(section_name, response)
+            except StructuredOutputError as e:
+                # Fix just the broken reply rather than paying for a full retry
+                logger.warning(f"Repairing structured output for {section_name}: {e}")
+                async with llm_queue.slot_async(current_client.get()):
+                    repair = await async_client.chat.completions.create(**repair_request(section_name, response, e))
+                token_usage.record(repair)
+                enhanced = structured_output.decode_repair(section_name, response, repair)
+            if enhancement_cache:
+                await asyncio.to_thread(enhancement_cache.add, section_name, content, enhanced)
+
+            logger.info(f"Successfully enhanced {section_name} ({len(enhanced)} chars, "
+                        f"{prompt_tokens} prompt + {completion_tokens} completion tokens)")
             return enhanced
 
         except Exception as e:
@@ -345,47 +544,87 @@ def enhance_section(section_name, content, max_retries=2):
             if attempt >= max_retries:
                 logger.warning(f"Max retries reached, returning original content for {section_name}")
                 return content
-            time.sleep(1 * (2 ** attempt))
+            await asyncio.sleep(1 * (2 ** attempt))
 
     return content
 
 
 def format_for_docx(text):
     """Format text into paragraphs for DOCX."""
-    if not text:
-        return
+    yield from docx_paragraphs(text)
 
-    text = text.strip()
 
-    # Handle comma-separated lists (skills)
-    if ',' in text and '\n' not in text and len(text.split(',')) > 2:
-        yield text
-        return
+# Bump when the DOCX/PDF layout changes so old artifacts are not reused
+ARTIFACT_FORMAT_VERSION = "1"
 
-    # Split by double newlines or "---"
-    for block in re.split(r'\n\s*\n|---', text):
-        block = block.strip()
-        if not block:
-            continue
 
-        lines = [ln.strip() for ln in block.splitlines() if ln.strip()]
+def artifact_filename(resume_data, extension):
+    """Content-addressed filename: identical resume data always maps to the same file."""
+    canonical = json.dumps(resume_data, sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha256(f"{ARTIFACT_FORMAT_VERSION}:{extension}:{canonical}".encode()).hexdigest()
+    return f"Resume_{digest[:16]}.{extension}"
 
-        # Check if it's a bullet list
-        is_list = all(re.match(r'^[•\-]\s+', ln) for ln in lines if ln)
 
-        if is_list and len(lines) > 1:
-            yield '\n'.join(lines)
-        else:
-            yield ' '.join(lines)
+def reuse_artifact(filepath):
+    """True if the artifact already exists; bumps its mtime so it counts as most recent."""
+    if not os.path.exists(filepath):
+        return False
+    os.utime(filepath)
+    logger.info(f"Reusing identical artifact: {filepath}")
+    return True
+
+
+def temp_path(filepath):
+    """Sibling path to render into before an atomic rename."""
+    return f"{filepath}.{uuid.uuid4().hex[:8]}.tmp"
+
+
+def discard_temp(tmp_filepath):
+    """Remove a temp render left behind when saving failed before the rename."""
+    if os.path.exists(tmp_filepath):
+        os.remove(tmp_filepath)
+
+
+@functools.lru_cache(maxsize=1024)
+def _file_digest(filepath, mtime_ns, size):
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_etag(filepath):
+    """Strong ETag from the file's SHA-256, cached until the file changes."""
+    stat = os.stat(filepath)
+    return _file_digest(os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+
+
+def resolve_artifact(extension, requested=None):
+    """Path of the requested artifact, or of the most recent one; None if missing."""
+    if requested:
+        filepath = os.path.join('generated', secure_filename(requested))
+        if filepath.endswith(extension) and os.path.isfile(filepath):
+            return filepath
+        return None
+
+    files = [f for f in os.listdir('generated') if f.endswith(extension)]
+    if not files:
+        return None
+    return max([os.path.join('generated', f) for f in files], key=os.path.getmtime)
 
 
 def create_enhanced_docx(resume_data, filename=None):
     """Create a professionally formatted DOCX resume."""
-    if not filename:
-        filename = f"Resume_{uuid.uuid4().hex[:8]}.docx"
+    # Only a content-addressed name guarantees an existing file has this content
+    content_addressed = not filename
+    if content_addressed:
+        filename = artifact_filename(resume_data, "docx")
 
     os.makedirs("generated", exist_ok=True)
     filepath = os.path.join("generated", filename)
+    if content_addressed and reuse_artifact(filepath):
+        return filepath
 
     doc = Document()
 
@@ -427,20 +666,31 @@ def create_enhanced_docx(resume_data, filename=None):
             para = doc.add_paragraph(paragraph_text)
             para.paragraph_format.space_after = Pt(6)
 
-    doc.save(filepath)
+    tmp_filepath = temp_path(filepath)
+    try:
+        doc.save(tmp_filepath)
+        os.replace(tmp_filepath, filepath)
+    finally:
+        discard_temp(tmp_filepath)
     logger.info(f"DOCX saved: {filepath}")
     return filepath
 
 
 def create_enhanced_pdf(resume_data, filename=None):
     """Create a professionally formatted PDF resume."""
-    if not filename:
-        filename = f"Resume_{uuid.uuid4().hex[:8]}.pdf"
+    # Only a content-addressed name guarantees an existing file has this content
+    content_addressed = not filename
+    if content_addressed:
+        filename = artifact_filename(resume_data, "pdf")
 
     os.makedirs("generated", exist_ok=True)
     filepath = os.path.join("generated", filename)
+    if content_addressed and reuse_artifact(filepath):
+        return filepath
 
-    doc = SimpleDocTemplate(filepath, pagesize=letter,
+    # invariant=1 drops timestamps/random IDs so identical input gives identical bytes
+    tmp_filepath = temp_path(filepath)
+    doc = SimpleDocTemplate(tmp_filepath, pagesize=letter, invariant=1,
                             topMargin=0.5 * inch, bottomMargin=0.5 * inch,
                             leftMargin=0.75 * inch, rightMargin=0.75 * inch)
 
@@ -538,11 +788,56 @@ def create_enhanced_pdf(resume_data, filename=None):
         story.append(Spacer(1, 0.1 * inch))
 
     # Build PDF
-    doc.build(story)
+    try:
+        doc.build(story)
+        os.replace(tmp_filepath, filepath)
+    finally:
+        discard_temp(tmp_filepath)
     logger.info(f"PDF saved: {filepath}")
     return filepath
 
 
+GZIP_MIN_BYTES = 500
+
+
+def gzip_body(body, accept_encoding):
+    """Gzipped body if the client accepts it and it is worth compressing, else None."""
+    if len(body) < GZIP_MIN_BYTES or 'gzip' not in accept_encoding.lower():
+        return None
+    return gzip.compress(body, compresslevel=6)
+
+
+@app.after_request
+def compress_json(response):
+    """Gzip JSON responses for clients that accept it."""
+    if response.mimetype != 'application/json' or response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return response
+    compressed = gzip_body(response.get_data(), request.headers.get('Accept-Encoding', ''))
+    if compressed is not None:
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+    return response
+
+
+def rate_limited(endpoint):
+    """Charge the caller's token bucket before running the view; reply 429 when empty."""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != "OPTIONS":
+                client_id = client_identity(request.headers, request.remote_addr, TRUSTED_PROXIES, API_KEYS)
+                retry_after = rate_limiter.check(client_id, ENDPOINT_COSTS[endpoint])
+                if retry_after:
+                    logger.warning(f"Rate limit exceeded for {client_id} on /{endpoint}")
+                    body, status, headers = rate_limit_error(retry_after)
+                    return jsonify(body), status, headers
+                current_client.set(client_id)
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
 # Routes
 @app.route("/")
 def index():
@@ -564,7 +859,14 @@ def health():
         'status': 'healthy',
         'groq_configured': bool(client),
         'model': GROQ_MODEL,
-        'api_key_present': bool(GROQ_API_KEY)
+        'api_key_present': bool(GROQ_API_KEY),
+        'llm_queue': llm_queue.stats(),
+        'similarity_cache': enhancement_cache.stats() if enhancement_cache else 'disabled',
+        'skills_fast_path': skills_engine.stats() if skills_engine else 'disabled',
+        'structured_output': structured_output.stats() if structured_output else 'disabled',
+        'token_usage': token_usage.stats(),
+        'job_journal': journal.stats() if journal else 'disabled',
+        'prompt_prefix_tokens': {name: count_tokens(p) for name, p in SYSTEM_PROMPTS.items()}
     }
 
     if client:
@@ -585,31 +887,42 @@ def health():
     return jsonify(status)
 
 
+def validate_enhance_payload(data):
+    """Validate an /enhance body; return (section, content, (error, status) or None)."""
+    if not data:
+        return None, None, ('No data received', 400)
+
+    section = data.get('section', '').strip()
+    content = data.get('content', '').strip()
+
+    if not section:
+        return None, None, ('Section name required', 400)
+
+    if not content:
+        return None, None, ('Content required', 400)
+
+    return section, content, None
+
+
 @app.route("/enhance", methods=["POST", "OPTIONS"])
+@rate_limited("enhance")
 def enhance_endpoint():
     """Enhance a single resume section."""
     if request.method == "OPTIONS":
         return "", 200
 
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'success': False, 'error': 'No data received'}), 400
-
-        section = data.get('section', '').strip()
-        content = data.get('content', '').strip()
-
-        if not section:
-            return jsonify({'success': False, 'error': 'Section name required'}), 400
-
-        if not content:
-            return jsonify({'success': False, 'error': 'Content required'}), 400
-
-        if not client:
-            return jsonify({'success': False, 'error': 'AI service unavailable'}), 503
+        section, content, error = validate_enhance_payload(request.get_json())
+        if error:
+            return jsonify({'success': False, 'error': error[0]}), error[1]
 
         logger.info(f"Enhancement request for: {section} ({len(content)} chars)")
-        enhanced = enhance_section(section, content)
+        # The local engine can answer even when Groq is down
+        enhanced = local_enhancement(section, content)
+        if not enhanced:
+            if not client:
+                return jsonify({'success': False, 'error': 'AI service unavailable'}), 503
+            enhanced = enhance_section(section, content, try_local=False)
 
         return jsonify({
             'success': True,
@@ -623,7 +936,158 @@ def enhance_endpoint():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+def collect_resume_sections(data):
+    """Split request data into ready resume fields and (field, section, content) items to enhance."""
+    resume_data = {}
+    pending = []
+
+    # Personal information
+    personal = data.get('personal', {})
+    if personal.get('fullName'):
+        resume_data['Name'] = personal['fullName']
+
+    contact_parts = []
+    for field in ['email', 'phone', 'location', 'linkedin']:
+        if personal.get(field):
+            contact_parts.append(personal[field])
+    if contact_parts:
+        resume_data['Contact Information'] = ' | '.join(contact_parts)
+
+    if personal.get('summary'):
+        pending.append(('Professional Summary', 'summary', personal['summary']))
+
+    # Work experience
+    experiences = data.get('experiences', [])
+    if experiences:
+        exp_texts = []
+        for exp in experiences:
+            if exp.get('title') or exp.get('company'):
+                exp_text = f"{exp.get('title', 'Position')} - {exp.get('company', 'Company')}"
+                if exp.get('startDate'):
+                    end = 'Present' if exp.get('current') else exp.get('endDate', '')
+                    exp_text += f" ({exp['startDate']} - {end})"
+                if exp.get('description'):
+                    exp_text += f"\n{exp['description']}"
+                exp_texts.append(exp_text)
+        if exp_texts:
+            pending.append(('Work Experience', 'experience', '\n\n'.join(exp_texts)))
+
+    # Education
+    education = data.get('education', [])
+    if education:
+        edu_texts = []
+        for edu in education:
+            parts = []
+            if edu.get('degree'):
+                parts.append(edu['degree'])
+            if edu.get('field'):
+                parts.append(f"in {edu['field']}")
+            if edu.get('institution'):
+                parts.append(f"- {edu['institution']}")
+            if edu.get('year'):
+                parts.append(f"({edu['year']})")
+            edu_text = ' '.join(parts)
+            if edu.get('details'):
+                edu_text += f"\n{edu['details']}"
+            if edu_text:
+                edu_texts.append(edu_text)
+        if edu_texts:
+            pending.append(('Education', 'education', '\n\n'.join(edu_texts)))
+
+    # Skills
+    if data.get('skills'):
+        pending.append(('Skills', 'skills', data['skills']))
+
+    # Projects
+    projects_list = data.get('projectsList', [])
+    if projects_list:
+        pending.append(('Projects', 'projects', json.dumps(projects_list)))
+
+    return resume_data, pending
+
+
+def start_job(data, headers):
+    """Return (job_id, finished stages) for a /generate_resume request.
+
+    Only requests with an Idempotency-Key are journaled, so a deliberate resubmission
+    without one always regenerates. The body is part of the id, so a key reused for
+    different data starts a new job.
+    """
+    if not journal:
+        return None, {}
+    idempotency_key = headers.get('Idempotency-Key', '').strip()
+    if not idempotency_key:
+        return None, {}
+    journal.prune_if_due(JOURNAL_RETENTION_DAYS * 86400)
+    job_id = job_key({'idempotency_key': idempotency_key, 'request': data})
+    return job_id, journal.load(job_id)
+
+
+def resume_finished_sections(finished, resume_data, pending):
+    """Fill in sections already in the journal; return the items still to enhance."""
+    remaining = []
+    for field, section, content in pending:
+        if f"section:{field}" in finished:
+            resume_data[field] = finished[f"section:{field}"]
+        else:
+            remaining.append((field, section, content))
+
+    skipped = len(pending) - len(remaining)
+    if skipped:
+        logger.info(f"Resuming job: {skipped} sections restored from journal")
+        journal.mark_resumed(skipped)
+    return remaining
+
+
+def checkpoint_section(job_id, field, section, content, enhanced):
+    """Journal a finished section; failed enhancements (original text back) are not kept."""
+    if not journal or not job_id or not enhanced:
+        return
+    if enhanced == content or enhanced == prepare_section(section, content)[1]:
+        return
+    journal.record(job_id, f"section:{field}", enhanced)
+
+
+def journaled_artifact(finished, kind):
+    """Filename of an artifact already rendered for this job, if it is still on disk."""
+    filename = finished.get(f"artifact:{kind}")
+    if filename and os.path.exists(os.path.join("generated", filename)):
+        return os.path.join("generated", filename)
+    return None
+
+
+def render_resume_files(resume_data, job_id=None, finished=None):
+    """Generate both formats and return the JSON payload for /generate_resume.
+
+    `finished` holds journaled stages; artifacts found there are reused. Only pass it
+    when every section was restored from the journal, otherwise the files are stale.
+    """
+    finished = finished or {}
+
+    docx_filepath = journaled_artifact(finished, "docx")
+    if not docx_filepath:
+        logger.info("Creating DOCX file...")
+        docx_filepath = create_enhanced_docx(resume_data)
+        if journal and job_id:
+            journal.record(job_id, "artifact:docx", os.path.basename(docx_filepath))
+
+    pdf_filepath = journaled_artifact(finished, "pdf")
+    if not pdf_filepath:
+        logger.info("Creating PDF file...")
+        pdf_filepath = create_enhanced_pdf(resume_data)
+        if journal and job_id:
+            journal.record(job_id, "artifact:pdf", os.path.basename(pdf_filepath))
+
+    return {
+        'success': True,
+        'message': 'Resume generated successfully',
+        'filename': os.path.basename(docx_filepath),
+        'pdf_filename': os.path.basename(pdf_filepath)
+    }
+
+
 @app.route("/generate_resume", methods=["POST", "OPTIONS"])
+@rate_limited("generate_resume")
 def generate_resume():
     """Generate complete enhanced resume in both DOCX and PDF formats."""
     if request.method == "OPTIONS":
@@ -634,91 +1098,18 @@ def generate_resume():
         if not data:
             return jsonify({'success': False, 'error': 'No data received'}), 400
 
-        resume_data = {}
-
-        # Personal information
-        personal = data.get('personal', {})
-        if personal.get('fullName'):
-            resume_data['Name'] = personal['fullName']
-
-        contact_parts = []
-        for field in ['email', 'phone', 'location', 'linkedin']:
-            if personal.get(field):
-                contact_parts.append(personal[field])
-        if contact_parts:
-            resume_data['Contact Information'] = ' | '.join(contact_parts)
-
-        if personal.get('summary'):
-            logger.info("Enhancing professional summary...")
-            resume_data['Professional Summary'] = enhance_section('summary', personal['summary'])
-
-        # Work experience
-        experiences = data.get('experiences', [])
-        if experiences:
-            exp_texts = []
-            for exp in experiences:
-                if exp.get('title') or exp.get('company'):
-                    exp_text = f"{exp.get('title', 'Position')} - {exp.get('company', 'Company')}"
-                    if exp.get('startDate'):
-                        end = 'Present' if exp.get('current') else exp.get('endDate', '')
-                        exp_text += f" ({exp['startDate']} - {end})"
-                    if exp.get('description'):
-                        exp_text += f"\n{exp['description']}"
-                    exp_texts.append(exp_text)
-            if exp_texts:
-                logger.info("Enhancing work experience...")
-                resume_data['Work Experience'] = enhance_section('experience', '\n\n'.join(exp_texts))
-
-        # Education
-        education = data.get('education', [])
-        if education:
-            edu_texts = []
-            for edu in education:
-                parts = []
-                if edu.get('degree'):
-                    parts.append(edu['degree'])
-                if edu.get('field'):
-                    parts.append(f"in {edu['field']}")
-                if edu.get('institution'):
-                    parts.append(f"- {edu['institution']}")
-                if edu.get('year'):
-                    parts.append(f"({edu['year']})")
-                edu_text = ' '.join(parts)
-                if edu.get('details'):
-                    edu_text += f"\n{edu['details']}"
-                if edu_text:
-                    edu_texts.append(edu_text)
-            if edu_texts:
-                logger.info("Enhancing education...")
-                resume_data['Education'] = enhance_section('education', '\n\n'.join(edu_texts))
-
-        # Skills
-        if data.get('skills'):
-            logger.info("Enhancing skills...")
-            resume_data['Skills'] = enhance_section('skills', data['skills'])
-
-        # Projects
-        projects_list = data.get('projectsList', [])
-        if projects_list:
-            logger.info(f"Enhancing {len(projects_list)} projects...")
-            resume_data['Projects'] = enhance_section('projects', json.dumps(projects_list))
+        job_id, finished = start_job(data, request.headers)
+        resume_data, pending = collect_resume_sections(data)
+        remaining = resume_finished_sections(finished, resume_data, pending)
+        for field, section, content in remaining:
+            logger.info(f"Enhancing {field.lower()}...")
+            resume_data[field] = enhance_section(section, content)
+            checkpoint_section(job_id, field, section, content, resume_data[field])
 
         if not resume_data:
             return jsonify({'success': False, 'error': 'No content to generate'}), 400
 
-        # Generate both formats
-        logger.info("Creating DOCX file...")
-        docx_filepath = create_enhanced_docx(resume_data)
-
-        logger.info("Creating PDF file...")
-        pdf_filepath = create_enhanced_pdf(resume_data)
-
-        return jsonify({
-            'success': True,
-            'message': 'Resume generated successfully',
-            'filename': os.path.basename(docx_filepath),
-            'pdf_filename': os.path.basename(pdf_filepath)
-        })
+        return jsonify(render_resume_files(resume_data, job_id, finished if not remaining else None))
 
     except Exception as e:
         logger.error(f"Generation error: {str(e)}")
@@ -728,17 +1119,18 @@ def generate_resume():
 
 @app.route("/download", methods=["GET"])
 def download():
-    """Download the most recent resume in DOCX format."""
+    """Download a resume in DOCX format (?filename=..., default most recent)."""
     try:
         if not os.path.exists('generated'):
             return jsonify({"error": "No resumes generated yet"}), 404
 
-        files = [f for f in os.listdir('generated') if f.endswith('.docx')]
-        if not files:
+        latest = resolve_artifact('.docx', request.args.get('filename'))
+        if not latest:
             return jsonify({"error": "No resume found"}), 404
 
-        latest = max([os.path.join('generated', f) for f in files], key=os.path.getctime)
-        return send_file(latest, as_attachment=True, download_name='Enhanced_Resume.docx')
+        # Conditional GET (If-None-Match -> 304) and Range/If-Range are handled by send_file
+        return send_file(os.path.abspath(latest), as_attachment=True, download_name='Enhanced_Resume.docx',
+                         etag=file_etag(latest), conditional=True)
 
     except Exception as e:
         logger.error(f"Download error: {str(e)}")
@@ -747,17 +1139,18 @@ def download():
 
 @app.route("/download_pdf", methods=["GET"])
 def download_pdf():
-    """Download the most recent resume in PDF format."""
+    """Download a resume in PDF format (?filename=..., default most recent)."""
     try:
         if not os.path.exists('generated'):
             return jsonify({"error": "No resumes generated yet"}), 404
 
-        files = [f for f in os.listdir('generated') if f.endswith('.pdf')]
-        if not files:
+        latest = resolve_artifact('.pdf', request.args.get('filename'))
+        if not latest:
             return jsonify({"error": "No PDF resume found"}), 404
 
-        latest = max([os.path.join('generated', f) for f in files], key=os.path.getctime)
-        return send_file(latest, as_attachment=True, download_name='Enhanced_Resume.pdf')
+        # Conditional GET (If-None-Match -> 304) and Range/If-Range are handled by send_file
+        return send_file(os.path.abspath(latest), as_attachment=True, download_name='Enhanced_Resume.pdf',
+                         etag=file_etag(latest), conditional=True)
 
     except Exception as e:
         logger.error(f"Download PDF error: {str(e)}")
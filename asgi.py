@@ -0,0 +1,167 @@
+"""ASGI serving mode for the Resume Builder backend.
+
+/enhance and /generate_resume are served by async Quart handlers that await
+the non-blocking Groq client, so a request waiting on the LLM costs a
+coroutine instead of an OS thread. Every other route is delegated to the
+existing Flask app, so the JSON contract is the same in both modes.
+
+Run with:
+    hypercorn asgi:application --bind 0.0.0.0:5000
+"""
+from quart import Quart, request, jsonify
+from hypercorn.middleware import AsyncioWSGIMiddleware
+from werkzeug.exceptions import UnsupportedMediaType
+from rate_limit import client_identity, rate_limit_error
+import asyncio
+import functools
+import traceback
+
+import app as backend
+from app import logger
+
+quart_app = Quart(__name__)
+
+# Flask routes (/health, /download, ...) keep running as WSGI in a thread pool
+flask_asgi = AsyncioWSGIMiddleware(backend.app)
+
+ASYNC_PATHS = {"/enhance", "/generate_resume"}
+
+
+@quart_app.after_request
+async def add_cors_headers(response):
+    """Mirror the Flask CORS configuration."""
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    response.headers["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
+    response.headers["Access-Control-Allow-Headers"] = "Content-Type, X-API-Key, Idempotency-Key"
+    response.headers["Access-Control-Expose-Headers"] = "Retry-After, ETag, Content-Range"
+    return response
+
+
+@quart_app.after_request
+async def compress_json(response):
+    """Gzip JSON responses for clients that accept it, as the Flask app does."""
+    if response.mimetype != 'application/json' or 'Content-Encoding' in response.headers:
+        return response
+    compressed = backend.gzip_body(await response.get_data(), request.headers.get('Accept-Encoding', ''))
+    if compressed is not None:
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+    return response
+
+
+def rate_limited(endpoint):
+    """Async twin of app.rate_limited, sharing its buckets and costs."""
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(*args, **kwargs):
+            if request.method != "OPTIONS":
+                client_id = client_identity(request.headers, request.remote_addr, backend.TRUSTED_PROXIES,
+                                            backend.API_KEYS)
+                # With the Redis backend this is a network round trip; keep it off the event loop
+                retry_after = await asyncio.to_thread(
+                    backend.rate_limiter.check, client_id, backend.ENDPOINT_COSTS[endpoint]
+                )
+                if retry_after:
+                    logger.warning(f"Rate limit exceeded for {client_id} on /{endpoint}")
+                    body, status, headers = rate_limit_error(retry_after)
+                    return jsonify(body), status, headers
+                backend.current_client.set(client_id)
+            return await view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+async def json_body():
+    """Parse the body as Flask's request.get_json() does, so bad requests get the same error in both modes."""
+    if not request.is_json:
+        # Quart returns None here; Flask raises
+        raise UnsupportedMediaType(
+            "Did not attempt to load JSON data because the request Content-Type was not 'application/json'."
+        )
+    return await request.get_json()
+
+
+@quart_app.route("/enhance", methods=["POST", "OPTIONS"])
+@rate_limited("enhance")
+async def enhance_endpoint():
+    """Enhance a single resume section."""
+    if request.method == "OPTIONS":
+        return "", 200
+
+    try:
+        data = await json_body()
+        section, content, error = backend.validate_enhance_payload(data)
+        if error:
+            return jsonify({'success': False, 'error': error[0]}), error[1]
+
+        logger.info(f"Enhancement request for: {section} ({len(content)} chars)")
+        # The local engine can answer even when Groq is down
+        enhanced = backend.local_enhancement(section, content)
+        if not enhanced:
+            if not backend.async_client:
+                return jsonify({'success': False, 'error': 'AI service unavailable'}), 503
+            enhanced = await backend.enhance_section_async(section, content, try_local=False)
+
+        return jsonify({
+            'success': True,
+            'enhanced_content': enhanced,
+            'section': section
+        })
+
+    except Exception as e:
+        logger.error(f"Enhancement error: {str(e)}")
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@quart_app.route("/generate_resume", methods=["POST", "OPTIONS"])
+@rate_limited("generate_resume")
+async def generate_resume():
+    """Generate complete enhanced resume in both DOCX and PDF formats."""
+    if request.method == "OPTIONS":
+        return "", 200
+
+    try:
+        data = await json_body()
+        if not data:
+            return jsonify({'success': False, 'error': 'No data received'}), 400
+
+        job_id, finished = await asyncio.to_thread(backend.start_job, data, request.headers)
+        resume_data, pending = backend.collect_resume_sections(data)
+        remaining = backend.resume_finished_sections(finished, resume_data, pending)
+
+        async def enhance_and_checkpoint(field, section, content):
+            text = await backend.enhance_section_async(section, content)
+            await asyncio.to_thread(backend.checkpoint_section, job_id, field, section, content, text)
+            return text
+
+        # Sections are independent, so enhance them concurrently
+        logger.info(f"Enhancing {len(remaining)} sections concurrently...")
+        enhanced = await asyncio.gather(*(
+            enhance_and_checkpoint(field, section, content)
+            for field, section, content in remaining
+        ))
+        for (field, _, _), text in zip(remaining, enhanced):
+            resume_data[field] = text
+
+        if not resume_data:
+            return jsonify({'success': False, 'error': 'No content to generate'}), 400
+
+        # DOCX/PDF rendering is blocking, keep it off the event loop
+        return jsonify(await asyncio.to_thread(
+            backend.render_resume_files, resume_data, job_id, finished if not remaining else None
+        ))
+
+    except Exception as e:
+        logger.error(f"Generation error: {str(e)}")
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+async def application(scope, receive, send):
+    """Route the LLM-backed endpoints to Quart and everything else to Flask."""
+    if scope["type"] == "lifespan" or scope.get("path") in ASYNC_PATHS:
+        await quart_app(scope, receive, send)
+    else:
+        await flask_asgi(scope, receive, send)
@@ -0,0 +1,46 @@
+"""Benchmark job journal write overhead and recovery time.
+
+    python bench_journal.py --jobs 2000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from job_journal import JobJournal
+
+SECTIONS = ['Professional Summary', 'Work Experience', 'Education', 'Skills', 'Projects']
+SECTION_TEXT = "Results-driven engineer with experience delivering scalable systems. " * 8
+
+
+def run(jobs):
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = JobJournal(os.path.join(tmp, "bench.db"))
+
+        write_times = []
+        for job in range(jobs):
+            for field in SECTIONS:
+                start = time.perf_counter()
+                journal.record(f"job-{job}", f"section:{field}", SECTION_TEXT)
+                write_times.append(time.perf_counter() - start)
+            journal.record(f"job-{job}", "artifact:docx", f"Resume_{job}.docx")
+            journal.record(f"job-{job}", "artifact:pdf", f"Resume_{job}.pdf")
+
+        load_times = []
+        for job in range(0, jobs, max(1, jobs // 500)):
+            start = time.perf_counter()
+            journal.load(f"job-{job}")
+            load_times.append(time.perf_counter() - start)
+
+    write_times.sort()
+    print(f"Journal entries:   {jobs * (len(SECTIONS) + 2)}")
+    print(f"Write p50 / p99:   {statistics.median(write_times) * 1000:.3f} / "
+          f"{write_times[int(len(write_times) * 0.99)] * 1000:.3f} ms")
+    print(f"Recovery (load) p50: {statistics.median(load_times) * 1000:.3f} ms per job")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=2000)
+    run(parser.parse_args().jobs)
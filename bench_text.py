@@ -0,0 +1,168 @@
+"""Golden-corpus check and throughput benchmark for text_normalizer.
+
+Compares the linear-time normalizer with the regex implementations it replaced
+(kept below as the reference) on a hand-written corpus plus randomly assembled
+inputs, then times both on typical and adversarial 100 KB inputs.
+
+    python bench_text.py --fuzz 20000
+"""
+import argparse
+import random
+import re
+import time
+
+from text_normalizer import collapse_whitespace, clean_response, docx_paragraphs
+
+
+# Reference implementations (app.py before the normalizer)
+def legacy_sanitize(text):
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def legacy_clean(text):
+    if not text:
+        return ""
+    text = re.sub(r'^```(?:\w+)?\s*|```$', '', text, flags=re.MULTILINE).strip()
+    patterns = [
+        r'^(?:Here\'s|Here is|Enhanced version:|Enhanced:|Sure,?.*?:)\s*',
+        r'^(?:Certainly|Of course|Absolutely).*?:\s*',
+        r'^\*\*.*?\*\*\s*',
+    ]
+    for pattern in patterns:
+        text = re.sub(pattern, '', text, flags=re.IGNORECASE | re.MULTILINE)
+    text = re.sub(r'^["\']|["\']$', '', text.strip())
+    return text.strip()
+
+
+def legacy_docx(text):
+    if not text:
+        return
+    text = text.strip()
+    if ',' in text and '\n' not in text and len(text.split(',')) > 2:
+        yield text
+        return
+    for block in re.split(r'\n\s*\n|---', text):
+        block = block.strip()
+        if not block:
+            continue
+        lines = [ln.strip() for ln in block.splitlines() if ln.strip()]
+        is_list = all(re.match(r'^[•\-]\s+', ln) for ln in lines if ln)
+        if is_list and len(lines) > 1:
+            yield '\n'.join(lines)
+        else:
+            yield ' '.join(lines)
+
+
+# Every character re treats as whitespace
+WHITESPACE = ''.join(chr(c) for c in range(0x110000) if re.match(r"\s", chr(c)))
+
+GOLDEN = [
+    "",
+    "Plain enhanced summary without artifacts.",
+    "Here's the enhanced version:\nResults-driven engineer with 6 years of experience.",
+    "Sure, here is your improved summary:\n\n\"Seasoned analyst skilled in SQL and Tableau.\"",
+    "Certainly! Here is the rewritten section:\n- Led a team of 5\n- Cut costs by 20%",
+    "```\nTitle: Resume Builder\nDescription: Flask app.\n---\nTitle: Chat Bot\nDescription: NLP bot.\n```",
+    "```markdown\n**Professional Summary**\nData scientist with NLP expertise.\n```",
+    "**Enhanced Skills:** Python, SQL, Docker, Kubernetes",
+    "Enhanced: 'Detail-oriented accountant with CPA certification.'",
+    "Of course: \n\n   Indented content after preamble",
+    "Here is\n\n\nHere's nested preamble\nBody",
+    "Absolutely, happy to help:\n**Title**\n  text",
+    "- Managed budgets\n- Improved throughput by 30%\n\nSecond paragraph here.",
+    "• Bullet one\n• Bullet two\n---\nTrailing block",
+    "Python, Java, SQL, Git",
+    "Line one\nline two\n\n\n\nline three   \n  \t\n line four",
+    "Title: A\nDescription: B\n---\n---\nTitle: C\nDescription: D---",
+    "  \r\n Windows\r\nline endings\r\n\r\nNext para\r\n",
+    "\"\"",
+    "'",
+    "``````",
+    "```python code```",
+    "Sure:\n```\n```\n'quoted'",
+    "Here's\n  **bold** rest\nCertainly: x",
+    "a" + WHITESPACE + "b" + "b".join(WHITESPACE) + "c",
+]
+
+FRAGMENTS = [
+    "```", "```python", "```json ", "Here's", "Here is the text:", "HERE IS", "Enhanced version:", "Enhanced:",
+    "Sure", "Sure,", "Sure, here it is:", "sure thing: ok", "Certainly", "Certainly!", "Of course: ", "Absolutely: yes",
+    "**", "**Bold**", "** x **", "'", '"', "-", "- item", "• item", "•x", "---", "----", ",", "a, b, c", ":",
+    " ", "  ", "\t", "\r", "\x0b", " ", " ", "word", "Led a team of 5", "Improved KPIs by 20%",
+]
+
+
+def random_text(rng):
+    parts = []
+    for _ in range(rng.randint(0, 12)):
+        parts.append(rng.choice(FRAGMENTS))
+        parts.append(rng.choice(["", " ", "\n", "\n\n", " \n ", "\n  ", ""]))
+    return ''.join(parts)
+
+
+def check(corpus):
+    mismatches = 0
+    for text in corpus:
+        results = [
+            (legacy_sanitize(text), collapse_whitespace(text)),
+            (legacy_clean(text), clean_response(text)),
+            (list(legacy_docx(text)), list(docx_paragraphs(text))),
+        ]
+        for expected, actual in results:
+            if expected != actual:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"MISMATCH for {text!r}:\n  expected {expected!r}\n  actual   {actual!r}")
+    return mismatches
+
+
+def timed(fn, text, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(text)
+        if not isinstance(result, str):
+            list(result)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(repeat):
+    paragraph = ("Results-driven engineer with 6 years of experience delivering scalable systems. "
+                 "Led a team of 5 and cut costs by 20%.\n- Built CI/CD pipelines\n- Migrated to AWS\n\n")
+    inputs = {
+        "typical 100 KB": ("Here's the enhanced version:\n" + paragraph * 700)[:100_000],
+        "typical, preamble on own line": ("Sure, here is your summary:\n\n" + paragraph * 700)[:100_000],
+        "one 100 KB line of 'Sure'": "Sure" * 25_000,
+        "100 KB of 'Sure' lines": "Sure, here\n" * 9_100,
+        "100 KB of '**' lines": "** unterminated bold\n" * 4_800,
+        "100 KB of bare preambles": "Sure:\n\n  " * 11_100,
+        "100 KB of bold headers": "**Skills**  text\n" * 5_800,
+        "newline + 100 KB spaces": "\n" + " " * 100_000 + "x",
+        "100 KB of fences": "```\n" * 25_000,
+    }
+    pairs = [
+        ("sanitize", legacy_sanitize, collapse_whitespace),
+        ("clean", legacy_clean, clean_response),
+        ("docx", legacy_docx, docx_paragraphs),
+    ]
+    print(f"{'input':30} {'function':9} {'legacy ms':>10} {'new ms':>10} {'new MB/s':>10}")
+    for label, text in inputs.items():
+        for name, old, new in pairs:
+            old_s = timed(old, text, repeat)
+            new_s = timed(new, text, repeat)
+            print(f"{label:30} {name:9} {old_s * 1000:10.2f} {new_s * 1000:10.2f} "
+                  f"{len(text) / new_s / 1e6:10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fuzz", type=int, default=20000, help="random inputs to compare")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    corpus = GOLDEN + [random_text(rng) for _ in range(args.fuzz)]
+    mismatches = check(corpus)
+    print(f"Golden corpus: {len(corpus)} inputs, {mismatches} mismatches\n")
+    benchmark(args.repeat)
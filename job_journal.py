@@ -0,0 +1,92 @@
+"""Append-only journal of resume generation progress.
+
+Every enhanced section and rendered artifact of a /generate_resume job is
+written to a local SQLite journal as soon as it is finished. When the same job
+is submitted again (a client retry, or a retry after a worker restart), the
+finished stages are read back and skipped instead of paying for their LLM
+calls again.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+
+def job_key(data):
+    """Stable job id for a JSON-serializable value, so an identical retry maps to the same job."""
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+
+class JobJournal:
+    """SQLite-backed journal; rows are only ever inserted (and pruned by age)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # WAL keeps appends cheap and readers unblocked; NORMAL still survives a process crash
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS journal ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "job_id TEXT NOT NULL, "
+            "stage TEXT NOT NULL, "
+            "payload TEXT NOT NULL, "
+            "created REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS journal_job ON journal (job_id)")
+        self._lock = threading.Lock()
+        self._last_prune = time.monotonic()
+        self._stats = {'writes': 0, 'write_seconds': 0.0, 'jobs_resumed': 0, 'stages_skipped': 0}
+
+    def record(self, job_id, stage, payload):
+        """Checkpoint one finished stage."""
+        start = time.perf_counter()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO journal (job_id, stage, payload, created) VALUES (?, ?, ?, ?)",
+                (job_id, stage, payload, time.time())
+            )
+            self._stats['writes'] += 1
+            self._stats['write_seconds'] += time.perf_counter() - start
+
+    def load(self, job_id):
+        """Finished stages of a job as {stage: payload}; later entries win."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT stage, payload FROM journal WHERE job_id = ? ORDER BY id", (job_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def mark_resumed(self, stages_skipped):
+        """Count a job that picked up finished stages from the journal."""
+        with self._lock:
+            self._stats['jobs_resumed'] += 1
+            self._stats['stages_skipped'] += stages_skipped
+
+    def prune(self, max_age_seconds):
+        """Drop entries older than max_age_seconds; returns the number removed."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM journal WHERE created < ?", (time.time() - max_age_seconds,))
+            self._last_prune = time.monotonic()
+        return cursor.rowcount
+
+    def prune_if_due(self, max_age_seconds, interval_seconds=3600):
+        """Prune at most once per interval, so a long-running worker keeps the journal bounded."""
+        with self._lock:
+            if time.monotonic() - self._last_prune < interval_seconds:
+                return 0
+            self._last_prune = time.monotonic()
+        return self.prune(max_age_seconds)
+
+    def stats(self):
+        """Write counts, mean write latency and resume counters, for /health."""
+        with self._lock:
+            stats = dict(self._stats)
+        writes = stats.pop('writes')
+        seconds = stats.pop('write_seconds')
+        stats['writes'] = writes
+        stats['avg_write_ms'] = round(seconds / writes * 1000, 3) if writes else 0.0
+        return stats
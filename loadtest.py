@@ -0,0 +1,225 @@
+"""Concurrent load test for the /enhance endpoint.
+
+Compare the two serving modes against a stubbed Groq client that sleeps for
+--llm-delay seconds per call, so the numbers measure the server rather than
+the provider (each mode runs in its own subprocess):
+    python loadtest.py --compare --llm-delay 1.5 --concurrency 200 --requests 2000
+
+Or point it at a running server (start it with RATE_LIMIT_RATE=0, or the
+per-client buckets will answer most requests with 429):
+    python app.py                                   # threaded Flask
+    hypercorn asgi:application --bind 0.0.0.0:5000  # async ASGI
+    python loadtest.py --url http://localhost:5000 --concurrency 200 --requests 2000
+
+A single stub server can also be started by hand:
+    python loadtest.py --serve async --port 5001 --llm-delay 1.5
+"""
+import argparse
+import asyncio
+import os
+import resource
+import ssl
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+
+SAMPLE_PAYLOAD = {
+    "section": "summary",
+    "content": "Software engineer with 5 years of experience in Python, Flask and AWS."
+}
+STUB_REPLY = "Results-driven software engineer with 5 years of experience building Python, Flask and AWS services."
+
+
+def stub_response():
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=STUB_REPLY))],
+        usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30, prompt_tokens_details=None)
+    )
+
+
+def stub_backend(llm_delay):
+    """Import the backend with sleeping Groq clients and a /loadtest/stats route; return (app module, peaks)."""
+    # The stub measures the serving mode, not rate limiting, queuing or caching
+    os.environ["GROQ_API_KEY"] = ""
+    for name, value in (("RATE_LIMIT_RATE", "0"), ("LLM_MAX_CONCURRENCY", "100000"),
+                        ("JOURNAL_ENABLED", "0"), ("SIMILARITY_CACHE_ENABLED", "0")):
+        os.environ.setdefault(name, value)
+
+    import logging
+    import app as backend
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+    def create(**kwargs):
+        time.sleep(llm_delay)
+        return stub_response()
+
+    async def create_async(**kwargs):
+        await asyncio.sleep(llm_delay)
+        return stub_response()
+
+    backend.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    backend.async_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create_async)))
+
+    peaks = {'threads': 0, 'tasks': 0}
+
+    def sample_threads():
+        while True:
+            peaks['threads'] = max(peaks['threads'], threading.active_count())
+            time.sleep(0.01)
+
+    threading.Thread(target=sample_threads, daemon=True).start()
+
+    @backend.app.route("/loadtest/stats")
+    def loadtest_stats():
+        return backend.jsonify({
+            'peak_threads': peaks['threads'],
+            'peak_tasks': peaks['tasks'],
+            'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        })
+
+    return backend, peaks
+
+
+def serve(mode, port, llm_delay):
+    """Run one serving mode on the stub backend until killed."""
+    backend, peaks = stub_backend(llm_delay)
+    if mode == "sync":
+        backend.app.run(host="127.0.0.1", port=port, threaded=True, debug=False)
+        return
+
+    from hypercorn.asyncio import serve as hypercorn_serve
+    from hypercorn.config import Config
+    from asgi import application
+
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.backlog = 4096
+    config.accesslog = None
+
+    async def main():
+        async def sample_tasks():
+            while True:
+                peaks['tasks'] = max(peaks['tasks'], len(asyncio.all_tasks()))
+                await asyncio.sleep(0.01)
+
+        sampler = asyncio.create_task(sample_tasks())
+        await hypercorn_serve(application, config)
+        sampler.cancel()
+
+    asyncio.run(main())
+
+
+async def worker(url, queue, latencies, statuses, ssl_context):
+    # One connection per worker: a single pool shared by hundreds of connections
+    # spends more CPU picking a connection than the server spends per request.
+    async with httpx.AsyncClient(timeout=120, verify=ssl_context, limits=httpx.Limits(max_connections=1)) as client:
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            try:
+                response = await client.post(f"{url}/enhance", json=SAMPLE_PAYLOAD)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] = statuses.get(type(e).__name__, 0) + 1
+            latencies.append(time.perf_counter() - start)
+
+
+async def run(url, concurrency, total):
+    """Send `total` requests over `concurrency` connections; return the summary."""
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    latencies, statuses = [], {}
+    ssl_context = ssl.create_default_context()
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        worker(url, queue, latencies, statuses, ssl_context)
+        for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': total,
+        'elapsed': elapsed,
+        'rps': total / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        'statuses': statuses,
+    }
+
+
+def print_summary(result, concurrency):
+    print(f"Requests:    {result['requests']} @ concurrency {concurrency}")
+    print(f"Elapsed:     {result['elapsed']:.2f}s ({result['rps']:.1f} req/s)")
+    print(f"Latency p50: {result['p50_ms']:.1f} ms")
+    print(f"Latency p95: {result['p95_ms']:.1f} ms")
+    print(f"Statuses:    {result['statuses']}")
+
+
+def wait_until_up(url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/health", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not come up")
+
+
+def compare(port, llm_delay, concurrency, total):
+    """Run the load against a stub server in each mode and print one row per mode."""
+    rows = []
+    for mode in ("sync", "async"):
+        url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--serve", mode, "--port", str(port),
+             "--llm-delay", str(llm_delay)],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_until_up(url)
+            result = asyncio.run(run(url, concurrency, total))
+            stats = httpx.get(f"{url}/loadtest/stats", timeout=10).json()
+        finally:
+            server.terminate()
+            server.wait()
+        rows.append((mode, result, stats))
+
+    print(f"{total} requests @ concurrency {concurrency}, stubbed LLM call {llm_delay}s\n")
+    print(f"{'mode':6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'threads':>8} {'tasks':>7} {'RSS MB':>7}  statuses")
+    for mode, result, stats in rows:
+        print(f"{mode:6} {result['rps']:8.1f} {result['p50_ms']:9.1f} {result['p95_ms']:9.1f} "
+              f"{stats['peak_threads']:8} {stats['peak_tasks']:7} {stats['peak_rss_mb']:7}  {result['statuses']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--compare", action="store_true", help="benchmark both modes on a stubbed LLM")
+    parser.add_argument("--serve", choices=("sync", "async"), help="run a stub server in this mode")
+    parser.add_argument("--port", type=int, default=5001, help="stub server port")
+    parser.add_argument("--llm-delay", type=float, default=1.5, help="seconds per stubbed LLM call")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port, args.llm_delay)
+    elif args.compare:
+        compare(args.port, args.llm_delay, args.concurrency, args.requests)
+    else:
+        print_summary(asyncio.run(run(args.url, args.concurrency, args.requests)), args.concurrency)
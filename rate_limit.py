@@ -0,0 +1,245 @@
+"""Per-client rate limiting and fair queuing for the LLM-backed endpoints.
+
+Token buckets cap how fast each client (API key or IP) may call /enhance and
+/generate_resume; a weighted fair queue then shares the limited number of
+concurrent LLM slots between clients so one busy client cannot starve others.
+"""
+from contextlib import contextmanager, asynccontextmanager
+import asyncio
+import hashlib
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+def client_identity(headers, remote_addr, trusted_proxies=0, api_keys=()):
+    """Identify the caller by API key when it is one of `api_keys`, otherwise by IP address.
+
+    Unknown keys are ignored, so a client cannot get a fresh bucket per request by
+    inventing keys. Behind `trusted_proxies` reverse proxies the peer address is the nearest proxy, so
+    the client IP is taken from X-Forwarded-For, counting that many hops from the right
+    (entries further left are client-supplied and cannot be trusted).
+    """
+    api_key = headers.get("X-API-Key", "").strip()
+    if api_key and api_key in api_keys:
+        # Never keep raw keys in bucket state or Redis
+        return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    if trusted_proxies:
+        forwarded = [hop.strip() for hop in headers.get("X-Forwarded-For", "").split(",") if hop.strip()]
+        if len(forwarded) >= trusted_proxies:
+            remote_addr = forwarded[-trusted_proxies]
+    return f"ip:{remote_addr or 'unknown'}"
+
+
+def rate_limit_error(retry_after):
+    """Body, status and headers for a 429 response."""
+    seconds = max(1, int(retry_after + 0.999))
+    return (
+        {'success': False, 'error': 'Rate limit exceeded', 'retry_after': seconds},
+        429,
+        {'Retry-After': str(seconds)}
+    )
+
+
+class MemoryBucketStore:
+    """Token buckets kept in process memory (one worker)."""
+
+    MAX_ENTRIES = 10000
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, cost, rate, capacity):
+        """Try to take `cost` tokens; return 0 if allowed, else seconds until it would be."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * rate)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                retry_after = 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                retry_after = (cost - tokens) / rate
+
+            if len(self._buckets) > self.MAX_ENTRIES:
+                self._prune(now, rate, capacity)
+        return retry_after
+
+    def _prune(self, now, rate, capacity):
+        """Drop buckets that have refilled completely; they equal a fresh bucket."""
+        full = [k for k, (tokens, last) in self._buckets.items()
+                if tokens + (now - last) * rate >= capacity]
+        for k in full:
+            del self._buckets[k]
+
+
+class RedisBucketStore:
+    """Token buckets shared by all workers through Redis."""
+
+    # Refill and take atomically; uses the Redis clock so workers need not agree on time
+    SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local capacity = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + (now - ts) * rate)
+    local retry_after = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+    else
+        retry_after = (cost - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return tostring(retry_after)
+    """
+
+    def __init__(self, url, prefix="ratelimit:"):
+        if redis is None:
+            raise RuntimeError("redis package is required for a shared rate limit backend")
+        self._redis = redis.Redis.from_url(url)
+        self._script = self._redis.register_script(self.SCRIPT)
+        self._prefix = prefix
+
+    def take(self, key, cost, rate, capacity):
+        """Try to take `cost` tokens; return 0 if allowed, else seconds until it would be."""
+        return float(self._script(keys=[self._prefix + key], args=[rate, capacity, cost]))
+
+
+class RateLimiter:
+    """Token-bucket limiter: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity, store=None):
+        self.rate = rate
+        self.capacity = capacity
+        self.store = store or MemoryBucketStore()
+
+    def check(self, client_id, cost=1):
+        """Charge `cost` tokens to the client; return 0 if allowed, else Retry-After seconds."""
+        if self.rate <= 0:
+            return 0.0
+        try:
+            return self.store.take(client_id, min(cost, self.capacity), self.rate, self.capacity)
+        except Exception as e:
+            # A broken shared backend should not take the API down with it
+            logger.error(f"Rate limit backend error: {e}")
+            return 0.0
+
+
+class _Ticket:
+    __slots__ = ("wake", "granted", "abandoned")
+
+    def __init__(self, wake):
+        self.wake = wake
+        self.granted = False
+        self.abandoned = False
+
+
+class FairQueue:
+    """Weighted fair queue (self-clocked) in front of a fixed number of LLM slots.
+
+    Each request gets a virtual finish tag of max(now, client's last tag) + cost / weight;
+    free slots always go to the smallest tag, so heavy clients queue behind their
+    own backlog while light clients get through quickly.
+    """
+
+    MAX_CLIENTS = 10000
+
+    def __init__(self, slots, weights=None):
+        self.slots = slots
+        self.weights = weights or {}
+        self._free = slots
+        self._heap = []
+        self._seq = itertools.count()
+        self._virtual_time = 0.0
+        self._last_finish = {}
+        self._lock = threading.Lock()
+
+    def _enqueue(self, client_id, cost, ticket):
+        weight = self.weights.get(client_id, 1.0)
+        start = max(self._virtual_time, self._last_finish.get(client_id, 0.0))
+        finish = start + cost / weight
+        self._last_finish[client_id] = finish
+        heapq.heappush(self._heap, (finish, next(self._seq), ticket))
+
+        if len(self._last_finish) > self.MAX_CLIENTS:
+            self._last_finish = {c: f for c, f in self._last_finish.items() if f > self._virtual_time}
+
+    def _dispatch(self):
+        while self._free and self._heap:
+            finish, _, ticket = heapq.heappop(self._heap)
+            if ticket.abandoned:
+                continue
+            self._virtual_time = finish
+            self._free -= 1
+            ticket.granted = True
+            ticket.wake()
+
+    def _release(self):
+        with self._lock:
+            self._free += 1
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, client_id, cost=1.0):
+        """Block the calling thread until this client's turn for an LLM slot."""
+        event = threading.Event()
+        with self._lock:
+            self._enqueue(client_id, cost, _Ticket(event.set))
+            self._dispatch()
+        event.wait()
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def slot_async(self, client_id, cost=1.0):
+        """Await this client's turn for an LLM slot without holding a thread."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def resolve():
+            if not future.done():
+                future.set_result(None)
+
+        ticket = _Ticket(lambda: loop.call_soon_threadsafe(resolve))
+        with self._lock:
+            self._enqueue(client_id, cost, ticket)
+            self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = ticket.granted
+                ticket.abandoned = True
+            if granted:
+                self._release()
+            raise
+
+        try:
+            yield
+        finally:
+            self._release()
+
+    def stats(self):
+        """Current slot usage, for /health."""
+        with self._lock:
+            waiting = sum(1 for _, _, t in self._heap if not t.abandoned)
+            return {'slots': self.slots, 'in_flight': self.slots - self._free, 'waiting': waiting}
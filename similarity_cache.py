@@ -0,0 +1,218 @@
+"""Near-duplicate cache for section enhancements.
+
+Inputs are normalized, split into character shingles and summarized with a
+MinHash signature; LSH banding finds previously enhanced inputs that are
+probably similar, and each candidate is then checked exactly before its
+enhancement is reused:
+
+- the exact Jaccard similarity of the shingle sets must clear the threshold,
+- both inputs must contain the same numbers (years, percentages, team sizes),
+- every word only one of the two inputs has must be a spelling variant of a
+  word only the other has, so a new or swapped skill, name or employer is
+  never answered with an enhancement written for different facts ('+', '#'
+  and '.' are part of a word, so C++, C# and C, or .NET and NET, differ).
+
+A reused enhancement is then adapted cheaply: the earlier input's misspellings
+are replaced with the new input's spelling wherever they appear in it.
+"""
+from collections import OrderedDict
+from difflib import SequenceMatcher
+import hashlib
+import random
+import re
+import threading
+
+# Keep '+', '#' and '.' inside tokens so C++, C# and .NET stay distinct from C and NET
+_NON_WORD = re.compile(r'[^\w\s+#.]+|\.+(?=\s|$)')
+_WORD_CHARS = re.compile(r'\w+')
+_SPACES = re.compile(r'\s+')
+_NUMBER = re.compile(r'\d+(?:[.,]\d+)*')
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def normalize(text):
+    """Lowercase, drop punctuation (but not the '+', '#' and '.' of names like C++) and collapse whitespace."""
+    return _SPACES.sub(' ', _NON_WORD.sub(' ', text.lower())).strip()
+
+
+def shingles(text, k=5):
+    """Set of overlapping k-character shingles of normalized text."""
+    if len(text) <= k:
+        return {text}
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def spelling_variant(word, candidates, min_ratio=0.8):
+    """The candidate `word` differs from only by a typo or two, or None.
+
+    Only letters and digits can be mistyped: C++ and C#, or .NET and NET, are different names.
+    """
+    symbols = _WORD_CHARS.sub('', word)
+    best, best_ratio = None, min_ratio
+    for c in candidates:
+        if _WORD_CHARS.sub('', c) != symbols:
+            continue
+        ratio = SequenceMatcher(None, word, c).ratio()
+        if ratio >= best_ratio:
+            best, best_ratio = c, ratio
+    return best
+
+
+def _match_case(word, like):
+    if like.isupper():
+        return word.upper()
+    if like[:1].isupper():
+        return word[:1].upper() + word[1:]
+    return word
+
+
+def adapt(enhanced, corrections):
+    """Rewrite misspelled words of an earlier input as the new input spells them."""
+    if not corrections:
+        return enhanced
+    # Whole tokens only, as normalize() splits them: a '+', '#' or '.' next to a word is part of it
+    pattern = re.compile(r'(?<![\w+#.])(?:' + '|'.join(map(re.escape, corrections)) + r')(?![\w+#]|\.\w)',
+                         re.IGNORECASE)
+    return pattern.sub(lambda m: _match_case(corrections[m.group().lower()], m.group()), enhanced)
+
+
+class MinHasher:
+    """MinHash signatures from universal hashing of 64-bit shingle hashes."""
+
+    def __init__(self, num_perm=64, seed=1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._perms = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+                       for _ in range(num_perm)]
+
+    def signature(self, shingle_set):
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), 'little')
+                  for s in shingle_set]
+        return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in self._perms)
+
+
+class _Entry:
+    __slots__ = ("section", "shingles", "numbers", "words", "enhanced", "bands")
+
+    def __init__(self, section, shingle_set, numbers, words, enhanced, bands):
+        self.section = section
+        self.shingles = shingle_set
+        self.numbers = numbers
+        self.words = words
+        self.enhanced = enhanced
+        self.bands = bands
+
+
+class SimilarityCache:
+    """LRU index of enhanced section inputs, searchable by near-duplicate similarity."""
+
+    def __init__(self, threshold=0.9, max_entries=5000, num_perm=64, bands=16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._hasher = MinHasher(num_perm)
+        self._entries = OrderedDict()
+        self._buckets = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._stats = {'lookups': 0, 'hits': 0, 'adapted': 0, 'misses': 0, 'rejected': 0}
+
+    def _band_keys(self, section, signature):
+        return [(section, i, signature[i * self.rows:(i + 1) * self.rows]) for i in range(self.bands)]
+
+    def _features(self, content):
+        norm = normalize(content)
+        shingle_set = shingles(norm)
+        return (shingle_set,
+                frozenset(_NUMBER.findall(content)),
+                frozenset(norm.split()),
+                self._hasher.signature(shingle_set))
+
+    def _corrections(self, entry, shingle_set, numbers, words):
+        """{old spelling: new spelling} if the entry may be reused for this input, else None."""
+        if jaccard(entry.shingles, shingle_set) < self.threshold:
+            return None
+        if entry.numbers != numbers:
+            return None
+        # Words the inputs do not share may only be typo fixes of each other
+        stale = entry.words - words
+        fresh = words - entry.words
+        if any(spelling_variant(word, stale) is None for word in fresh):
+            return None
+        corrections = {}
+        for word in stale:
+            variant = spelling_variant(word, fresh)
+            if variant is None:
+                return None
+            corrections[word] = variant
+        return corrections
+
+    def lookup(self, section, content):
+        """Return a reusable (adapted) enhancement for a near-duplicate input, or None."""
+        shingle_set, numbers, words, signature = self._features(content)
+        with self._lock:
+            self._stats['lookups'] += 1
+            candidates = set()
+            for key in self._band_keys(section, signature):
+                candidates |= self._buckets.get(key, set())
+
+            best, best_score, best_corrections = None, -1.0, None
+            rejected = False
+            for entry_id in candidates:
+                entry = self._entries[entry_id]
+                corrections = self._corrections(entry, shingle_set, numbers, words)
+                if corrections is None:
+                    rejected = True
+                    continue
+                score = jaccard(entry.shingles, shingle_set)
+                if score > best_score:
+                    best, best_score, best_corrections = entry_id, score, corrections
+
+            if best is None:
+                self._stats['rejected' if rejected else 'misses'] += 1
+                return None
+
+            self._entries.move_to_end(best)
+            self._stats['hits'] += 1
+            if best_corrections:
+                self._stats['adapted'] += 1
+            enhanced = self._entries[best].enhanced
+        return adapt(enhanced, best_corrections)
+
+    def add(self, section, content, enhanced):
+        """Index an input and the enhancement produced for it."""
+        shingle_set, numbers, words, signature = self._features(content)
+        bands = self._band_keys(section, signature)
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = _Entry(section, shingle_set, numbers, words, enhanced, bands)
+            for key in bands:
+                self._buckets.setdefault(key, set()).add(entry_id)
+
+            while len(self._entries) > self.max_entries:
+                old_id, old = self._entries.popitem(last=False)
+                for key in old.bands:
+                    bucket = self._buckets.get(key)
+                    if bucket:
+                        bucket.discard(old_id)
+                        if not bucket:
+                            del self._buckets[key]
+
+    def stats(self):
+        """Lookup counters and hit rate, for /health."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        stats['hit_rate'] = round(stats['hits'] / stats['lookups'], 4) if stats['lookups'] else 0.0
+        return stats
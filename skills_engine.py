@@ -0,0 +1,315 @@
+"""Local normalization engine for the Skills section.
+
+Most skills inputs only need deduplication, canonical casing, acronym
+expansion, grouping and a length cap, which a taxonomy lookup handles in
+microseconds. The engine reports a confidence (the share of items it
+recognised); callers fall back to the LLM when it is too low.
+"""
+import re
+import threading
+
+# Category -> canonical skill -> extra aliases. A canonical name written as
+# "Long Name (ACR)" is also matched by "ACR" and "Long Name" automatically.
+SKILL_TAXONOMY = {
+    "Technical": {
+        "Python": ["py", "python3"],
+        "Java": [],
+        "JavaScript": ["js", "ecmascript", "es6"],
+        "TypeScript": ["ts"],
+        "C": [],
+        "C++": ["cpp"],
+        "C#": ["csharp", "c sharp"],
+        "Go": ["golang"],
+        "Rust": [],
+        "Ruby": [],
+        "PHP": [],
+        "Swift": [],
+        "Kotlin": [],
+        "Scala": [],
+        "R": [],
+        "MATLAB": [],
+        "Bash": [],
+        "SQL": [],
+        "MySQL": [],
+        "PostgreSQL": ["postgres", "psql"],
+        "MongoDB": ["mongo"],
+        "Redis": [],
+        "SQLite": [],
+        "Oracle Database": ["oracle", "oracle db"],
+        "Microsoft SQL Server": ["sql server", "mssql"],
+        "NoSQL": [],
+        "HTML": [],
+        "HTML5": [],
+        "CSS": [],
+        "CSS3": [],
+        "Sass": ["scss"],
+        "Tailwind CSS": ["tailwind", "tailwindcss"],
+        "Bootstrap": [],
+        "React": ["reactjs", "react js"],
+        "React Native": [],
+        "Next.js": ["nextjs"],
+        "Angular": [],
+        "AngularJS": ["angular js"],
+        "Vue.js": ["vue", "vuejs"],
+        "Redux": [],
+        "Node.js": ["node", "nodejs"],
+        "Express.js": ["express", "expressjs"],
+        "Django": [],
+        "Flask": [],
+        "FastAPI": [],
+        "Spring Boot": [],
+        "Ruby on Rails": ["rails"],
+        ".NET": ["dotnet"],
+        "GraphQL": [],
+        "REST APIs": ["rest api", "restful", "restful apis", "restful api"],
+        "Microservices": ["microservice"],
+        "Amazon Web Services (AWS)": [],
+        "Microsoft Azure": ["azure"],
+        "Google Cloud Platform (GCP)": ["google cloud"],
+        "Docker": [],
+        "Kubernetes": ["k8s"],
+        "Terraform": [],
+        "Ansible": [],
+        "Jenkins": [],
+        "Continuous Integration/Continuous Deployment (CI/CD)": ["ci cd", "cicd"],
+        "GitHub Actions": [],
+        "Git": [],
+        "GitHub": [],
+        "GitLab": [],
+        "Linux": [],
+        "Unix": [],
+        "Machine Learning (ML)": [],
+        "Deep Learning": [],
+        "Artificial Intelligence (AI)": [],
+        "Natural Language Processing (NLP)": [],
+        "Computer Vision": [],
+        "Large Language Models (LLMs)": ["llm", "llms"],
+        "TensorFlow": [],
+        "PyTorch": [],
+        "scikit-learn": ["sklearn", "scikit learn"],
+        "Pandas": [],
+        "NumPy": [],
+        "Data Analysis": [],
+        "Data Visualization": [],
+        "Data Science": [],
+        "Data Engineering": [],
+        "ETL": ["extract transform load"],
+        "Apache Spark": ["spark"],
+        "PySpark": [],
+        "Apache Kafka": ["kafka"],
+        "Hadoop": [],
+        "Tableau": [],
+        "Power BI": ["powerbi"],
+        "Microsoft Excel": ["excel", "ms excel"],
+        "Statistics": [],
+        "Unit Testing": [],
+        "Test-Driven Development (TDD)": [],
+        "Selenium": [],
+        "Jest": [],
+        "Pytest": [],
+        "Object-Oriented Programming (OOP)": [],
+        "Data Structures and Algorithms": ["dsa"],
+        "Data Structures": [],
+        "Algorithms": [],
+        "System Design": [],
+        "Cybersecurity": ["cyber security"],
+        "Information Security": [],
+        "Networking": [],
+        "Figma": [],
+        "Adobe Photoshop": ["photoshop"],
+        "Adobe Illustrator": ["illustrator"],
+        "User Interface/User Experience (UI/UX) Design": ["ui ux", "uiux", "ui ux design"],
+        "Search Engine Optimization (SEO)": [],
+        "Search Engine Marketing (SEM)": [],
+        "Pay-Per-Click (PPC) Advertising": ["ppc"],
+        "Google Analytics": [],
+        "Content Marketing": [],
+        "Social Media Marketing": [],
+        "Social Media": [],
+        "Email Marketing": [],
+        "Customer Relationship Management (CRM)": [],
+        "Salesforce": [],
+        "HubSpot": [],
+        "Enterprise Resource Planning (ERP)": [],
+        "SAP": [],
+        "Jira": [],
+        "Confluence": [],
+    },
+    "Methodologies": {
+        "Agile": ["agile methodology", "agile methodologies"],
+        "Scrum": [],
+        "Kanban": [],
+        "Project Management": [],
+        "Product Management": [],
+        "Software Development Life Cycle (SDLC)": [],
+        "DevOps": [],
+        "Lean Six Sigma": [],
+        "Six Sigma": [],
+        "Key Performance Indicators (KPIs)": ["kpi"],
+        "Business Analysis": [],
+        "Financial Analysis": [],
+        "Budgeting": [],
+        "Market Research": [],
+        "Quality Assurance (QA)": [],
+    },
+    "Certifications": {
+        "Project Management Professional (PMP)": [],
+        "Certified ScrumMaster (CSM)": [],
+        "AWS Certified Solutions Architect": [],
+        "Certified Public Accountant (CPA)": [],
+        "Certified Information Systems Security Professional (CISSP)": [],
+        "CompTIA Security+": ["security+", "security plus"],
+    },
+    "Soft Skills": {
+        "Communication": ["communication skills"],
+        "Verbal Communication": [],
+        "Written Communication": [],
+        "Leadership": ["team leadership", "leading teams"],
+        "Teamwork": ["team work", "team player"],
+        "Problem Solving": ["problem-solving", "problem solving skills"],
+        "Critical Thinking": [],
+        "Time Management": [],
+        "Adaptability": [],
+        "Attention to Detail": ["detail oriented", "detail-oriented"],
+        "Creativity": [],
+        "Public Speaking": [],
+        "Negotiation": [],
+        "Customer Service": [],
+        "Stakeholder Management": [],
+        "Mentoring": ["mentorship"],
+        "Conflict Resolution": [],
+        "Decision Making": ["decision-making"],
+        "Organizational Skills": ["organisational skills"],
+    },
+}
+
+_ACRONYM = re.compile(r'^(.*?)\s*\(([^)]+)\)\s*$')
+_KEY_STRIP = re.compile(r'[^a-z0-9+#]+')
+_SPLIT = re.compile(r'[,;\n|•]+')
+_BULLET = re.compile(r'^\s*[-*•]\s*')
+_AND = re.compile(r'\s+(?:and|&)\s+', re.IGNORECASE)
+
+MAX_SKILLS = 15
+MAX_ITEM_WORDS = 5
+
+
+def skill_key(text):
+    """Lookup key: lowercase with punctuation and spacing removed ("Node.JS" -> "nodejs")."""
+    return _KEY_STRIP.sub('', text.lower())
+
+
+def build_index(taxonomy):
+    """Compile the taxonomy into alias key -> (canonical name, category rank)."""
+    index = {}
+    for rank, (category, skills) in enumerate(taxonomy.items()):
+        for canonical, aliases in skills.items():
+            names = [canonical] + list(aliases)
+            match = _ACRONYM.match(canonical)
+            if match:
+                names += [match.group(1), match.group(2)]
+            for name in names:
+                index.setdefault(skill_key(name), (canonical, rank))
+    return index
+
+
+SKILL_INDEX = build_index(SKILL_TAXONOMY)
+
+
+def build_word_casing(taxonomy):
+    """Lowercase word -> the casing the taxonomy writes it with ("etl" -> "ETL", "excel" -> "Excel")."""
+    casing = {}
+    for skills in taxonomy.values():
+        for canonical in skills:
+            for word in canonical.replace('(', ' ').replace(')', ' ').split():
+                casing.setdefault(word.lower(), word)
+    return casing
+
+
+WORD_CASING = build_word_casing(SKILL_TAXONOMY)
+
+
+def fix_casing(item):
+    """Capitalize all-lowercase unknown skills; leave anything the user already cased.
+
+    Words the taxonomy knows take its casing ("etl pipelines" -> "ETL Pipelines"); other
+    words of three letters or fewer are kept as typed, since they are mostly acronyms
+    ("vba") or connectives and "Vba" would be wrong either way.
+    """
+    if item != item.lower():
+        return item
+    return ' '.join(WORD_CASING.get(word, word if len(word) <= 3 else word[:1].upper() + word[1:])
+                    for word in item.split())
+
+
+def split_items(text):
+    """Break free text into candidate skill items."""
+    items = []
+    for raw in _SPLIT.split(text):
+        item = _BULLET.sub('', raw).strip().strip('.')
+        if ':' in item:
+            # "Technical Skills: Python" -> "Python"
+            item = item.split(':', 1)[1].strip()
+        if not item:
+            continue
+        parts = _AND.split(item)
+        if len(parts) > 1 and all(skill_key(p) in SKILL_INDEX for p in parts):
+            items.extend(p.strip() for p in parts)
+        else:
+            items.append(item)
+    return items
+
+
+def normalize_skills(text):
+    """Return (normalized comma-separated skills, confidence between 0 and 1)."""
+    items = split_items(text or "")
+    if not items:
+        return "", 0.0
+
+    seen = set()
+    ranked = []
+    known = 0
+    for position, item in enumerate(items):
+        if len(item.split()) > MAX_ITEM_WORDS:
+            # Prose rather than a skills list; leave it to the LLM
+            return "", 0.0
+        match = SKILL_INDEX.get(skill_key(item))
+        if match:
+            known += 1
+            name, rank = match
+        else:
+            name, rank = fix_casing(item), 0
+        key = skill_key(name)
+        if key in seen:
+            continue
+        seen.add(key)
+        ranked.append((rank, position, name))
+
+    # Group by category (technical first, soft skills last), keeping input order inside a group
+    ranked.sort()
+    result = ', '.join(name for _, _, name in ranked[:MAX_SKILLS])
+    return result, known / len(items)
+
+
+class SkillsEngine:
+    """Skills fast path with counters for how many LLM calls it avoided."""
+
+    def __init__(self, min_confidence=0.7):
+        self.min_confidence = min_confidence
+        self._lock = threading.Lock()
+        self._stats = {'local': 0, 'llm_fallback': 0}
+
+    def enhance(self, text):
+        """Normalized skills, or None when confidence is too low and the LLM should handle it."""
+        result, confidence = normalize_skills(text)
+        accepted = bool(result) and confidence >= self.min_confidence
+        with self._lock:
+            self._stats['local' if accepted else 'llm_fallback'] += 1
+        return result if accepted else None
+
+    def stats(self):
+        """Counters and share of skills calls served locally, for /health."""
+        with self._lock:
+            stats = dict(self._stats)
+        total = stats['local'] + stats['llm_fallback']
+        stats['llm_calls_avoided'] = round(stats['local'] / total, 4) if total else 0.0
+        return stats
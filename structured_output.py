@@ -0,0 +1,185 @@
+"""Structured JSON output mode for section enhancement.
+
+Instead of free text cleaned up with regexes, the model is asked for a JSON
+object with a fixed shape per section. The reply is validated with a single
+json.loads plus a schema walk and rendered straight into the text layout the
+DOCX/PDF builders and the frontend already use. A malformed reply is first
+repaired locally (fences or chatter around the object); failing that, only the
+broken reply and the validation error are sent back to the model, which is far
+cheaper than repeating the full prompt.
+"""
+import json
+import threading
+
+# "string" is a non-empty string, [spec] a non-empty list, {key: spec} an object with those keys
+SECTION_SCHEMAS = {
+    "summary": {"summary": "string"},
+    "experience": {"roles": [{"heading": "string", "bullets": ["string"]}]},
+    "skills": {"skills": ["string"]},
+    "education": {"education": "string"},
+    "projects": {"projects": [{"title": "string", "description": "string"}]},
+}
+
+REPAIR_SYSTEM_MESSAGE = "You fix malformed JSON. Return only the corrected JSON object, nothing else."
+
+
+class StructuredOutputError(ValueError):
+    """The model reply is not valid JSON for the section schema."""
+
+
+def schema_for(section_name):
+    return SECTION_SCHEMAS.get(section_name, SECTION_SCHEMAS["summary"])
+
+
+def schema_example(spec):
+    """Compact JSON rendering of a schema for the prompt."""
+    return json.dumps(spec, ensure_ascii=False)
+
+
+def validate(value, spec, path="$"):
+    """Return None if value matches spec, else a message naming the first mismatch."""
+    if spec == "string":
+        if not isinstance(value, str) or not value.strip():
+            return f"{path} must be a non-empty string"
+        return None
+    if isinstance(spec, list):
+        if not isinstance(value, list) or not value:
+            return f"{path} must be a non-empty array"
+        for i, item in enumerate(value):
+            error = validate(item, spec[0], f"{path}[{i}]")
+            if error:
+                return error
+        return None
+    if not isinstance(value, dict):
+        return f"{path} must be an object"
+    for key, sub_spec in spec.items():
+        if key not in value:
+            return f"{path}.{key} is missing"
+        error = validate(value[key], sub_spec, f"{path}.{key}")
+        if error:
+            return error
+    return None
+
+
+def extract_json_object(text):
+    """Cut the outermost {...} out of a reply wrapped in fences or commentary."""
+    start, end = text.find('{'), text.rfind('}')
+    if start == -1 or end <= start:
+        return None
+    return text[start:end + 1]
+
+
+def render(section_name, data):
+    """Map validated JSON onto the text layout used by the document builders."""
+    if section_name == "experience":
+        # Heading and bullets are separate blocks, so the bullets stay a list in the DOCX
+        blocks = []
+        for role in data["roles"]:
+            blocks.append(role["heading"].strip())
+            if role["bullets"]:
+                blocks.append('\n'.join(f"- {bullet.strip()}" for bullet in role["bullets"]))
+        return '\n\n'.join(blocks)
+    if section_name == "skills":
+        return ', '.join(skill.strip() for skill in data["skills"])
+    if section_name == "education":
+        return data["education"].strip()
+    if section_name == "projects":
+        return '\n\n'.join(f"Title: {p['title'].strip()}\nDescription: {p['description'].strip()}"
+                           for p in data["projects"])
+    return data["summary"].strip()
+
+
+def usage_tokens(response):
+    """Prompt + completion tokens of a response, 0 when the provider omits usage."""
+    usage = getattr(response, "usage", None)
+    if not usage:
+        return 0
+    return (usage.prompt_tokens or 0) + (usage.completion_tokens or 0)
+
+
+class StructuredOutput:
+    """Prompt instructions, parsing, repair and counters for JSON mode."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {
+            'responses': 0,
+            'valid_first_try': 0,
+            'local_repairs': 0,
+            'llm_repairs': 0,
+            'failed': 0,
+            'retries_avoided': 0,
+            'tokens_saved': 0,
+        }
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, delta in deltas.items():
+                self._stats[key] += delta
+
+    def instructions(self, section_name):
+        """Prompt suffix asking for JSON in the section's shape."""
+        return (
+            "Output Format (overrides any plain-text format described above):\n"
+            "Respond with a single JSON object and nothing else, shaped exactly like:\n"
+            f"{schema_example(schema_for(section_name))}"
+        )
+
+    def request_options(self):
+        """Extra chat completion arguments enabling provider-side JSON mode."""
+        return {"response_format": {"type": "json_object"}}
+
+    def _parse(self, section_name, text):
+        try:
+            data = json.loads(text)
+        except (json.JSONDecodeError, TypeError) as e:
+            raise StructuredOutputError(f"invalid JSON: {e}")
+        error = validate(data, schema_for(section_name))
+        if error:
+            raise StructuredOutputError(error)
+        return render(section_name, data)
+
+    def decode(self, section_name, response):
+        """Rendered text for a completion, repairing wrapped JSON locally if needed."""
+        text = response.choices[0].message.content or ""
+        self._count(responses=1)
+        try:
+            rendered = self._parse(section_name, text)
+            self._count(valid_first_try=1)
+            return rendered
+        except StructuredOutputError as first_error:
+            candidate = extract_json_object(text)
+            if candidate is None or candidate == text:
+                raise first_error
+            rendered = self._parse(section_name, candidate)
+            # Without the local repair this would have been a full retry
+            self._count(local_repairs=1, retries_avoided=1, tokens_saved=usage_tokens(response))
+            return rendered
+
+    def repair_request(self, section_name, response, error):
+        """Chat messages asking the model to fix only its broken reply."""
+        text = response.choices[0].message.content or ""
+        return [
+            {"role": "system", "content": REPAIR_SYSTEM_MESSAGE},
+            {"role": "user", "content": (
+                f"Required shape: {schema_example(schema_for(section_name))}\n"
+                f"Problem: {error}\n"
+                f"Reply to fix:\n{text}"
+            )}
+        ]
+
+    def decode_repair(self, section_name, response, repair_response):
+        """Rendered text for a repair reply; counts the failure if it is still broken."""
+        try:
+            rendered = self._parse(section_name, repair_response.choices[0].message.content or "")
+        except StructuredOutputError:
+            self._count(failed=1)
+            raise
+        saved = max(0, usage_tokens(response) - usage_tokens(repair_response))
+        self._count(llm_repairs=1, retries_avoided=1, tokens_saved=saved)
+        return rendered
+
+    def stats(self):
+        """Counters for /health."""
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,39 @@
+import os
+
+import pytest
+from docx import Document
+
+os.environ["GROQ_API_KEY"] = ""
+os.environ["JOURNAL_ENABLED"] = "0"
+
+
+def test_caller_named_file_is_rewritten(tmp_path, monkeypatch):
+    import app
+
+    monkeypatch.chdir(tmp_path)
+    app.create_enhanced_docx({"Professional Summary": "First version."}, "x.docx")
+    path = app.create_enhanced_docx({"Professional Summary": "Second version."}, "x.docx")
+    assert "Second version." in [p.text for p in Document(path).paragraphs]
+
+
+def test_content_addressed_file_is_reused(tmp_path, monkeypatch):
+    import app
+
+    monkeypatch.chdir(tmp_path)
+    data = {"Professional Summary": "Same content."}
+    first = app.create_enhanced_docx(data)
+    os.utime(first, (0, 0))
+    assert app.create_enhanced_docx(data) == first
+    assert os.path.getmtime(first) > 0
+
+
+def test_failed_save_leaves_no_temp_file(tmp_path, monkeypatch):
+    import app
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(app.os, "replace", lambda src, dst: (_ for _ in ()).throw(OSError("disk full")))
+    with pytest.raises(OSError):
+        app.create_enhanced_docx({"Professional Summary": "Text."})
+    with pytest.raises(OSError):
+        app.create_enhanced_pdf({"Professional Summary": "Text."})
+    assert os.listdir(tmp_path / "generated") == []
@@ -0,0 +1,30 @@
+import asyncio
+import os
+
+import pytest
+
+os.environ["GROQ_API_KEY"] = ""
+os.environ["JOURNAL_ENABLED"] = "0"
+
+
+@pytest.mark.parametrize("path", ["/enhance", "/generate_resume"])
+@pytest.mark.parametrize("body, content_type", [
+    ("not json", "text/plain"),
+    ("not json", "application/json"),
+    ('{"section": "skills", "content": "python"}', "text/plain"),
+    ('{"section": "skills", "content": "python"}', "application/json"),
+])
+def test_body_parsing_matches_flask(path, body, content_type, monkeypatch):
+    import app
+    import asgi
+
+    monkeypatch.setattr(app.rate_limiter, "rate", 0)
+
+    flask_response = app.app.test_client().post(path, data=body, content_type=content_type)
+
+    async def post():
+        response = await asgi.quart_app.test_client().post(path, data=body, headers={"Content-Type": content_type})
+        return response.status_code, await response.get_json()
+
+    assert flask_response.status_code != 429
+    assert asyncio.run(post()) == (flask_response.status_code, flask_response.get_json())
@@ -0,0 +1,19 @@
+from rate_limit import client_identity, RateLimiter
+
+
+def test_unknown_api_keys_share_the_ip_bucket():
+    ids = {client_identity({"X-API-Key": f"k{i}"}, "10.0.0.1", api_keys={"real"}) for i in range(30)}
+    assert ids == {"ip:10.0.0.1"}
+
+
+def test_listed_api_key_gets_its_own_bucket():
+    assert client_identity({"X-API-Key": "real"}, "10.0.0.1", api_keys={"real"}).startswith("key:")
+
+
+def test_invented_keys_are_rate_limited():
+    limiter = RateLimiter(rate=0.001, capacity=10)
+    allowed = sum(
+        not limiter.check(client_identity({"X-API-Key": f"k{i}"}, "10.0.0.1", api_keys=frozenset()))
+        for i in range(30)
+    )
+    assert allowed == 10
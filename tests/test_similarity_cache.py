@@ -0,0 +1,51 @@
+from similarity_cache import SimilarityCache
+
+SKILLS = ("Python, JavaScript, TypeScript, React, Node.js, Docker, Kubernetes, AWS, "
+          "PostgreSQL, MongoDB, Redis, GraphQL, Terraform, Jenkins")
+SUMMARY = ("Backend engineer with 6 years of experience building payment APIs and data "
+           "pipelines in Python and Go for fintech startups")
+
+
+def test_reuses_identical_input():
+    cache = SimilarityCache(threshold=0.85)
+    cache.add("skills", SKILLS, "Enhanced: " + SKILLS)
+    assert cache.lookup("skills", SKILLS) == "Enhanced: " + SKILLS
+
+
+def test_rejects_added_word():
+    cache = SimilarityCache(threshold=0.85)
+    cache.add("skills", SKILLS, SKILLS)
+    assert cache.lookup("skills", SKILLS + ", Go") is None
+    assert cache.stats()['rejected'] == 1
+
+
+def test_rejects_swapped_word():
+    cache = SimilarityCache(threshold=0.85)
+    cache.add("summary", SUMMARY, "Seasoned backend engineer fluent in Python and Go.")
+    assert cache.lookup("summary", SUMMARY.replace("and Go", "and Rust")) is None
+
+
+def test_adapts_typo_fix():
+    cache = SimilarityCache(threshold=0.85)
+    typo = SUMMARY.replace("Python", "Pyhton")
+    cache.add("summary", typo, "Seasoned backend engineer fluent in Pyhton and Go.")
+    assert cache.lookup("summary", SUMMARY) == "Seasoned backend engineer fluent in Python and Go."
+    assert cache.stats()['adapted'] == 1
+
+
+def test_rejects_cpp_for_csharp():
+    cache = SimilarityCache(threshold=0.85)
+    skills = SKILLS + ", C++"
+    cache.add("skills", skills, skills)
+    assert cache.lookup("skills", SKILLS + ", C#") is None
+
+    summary = "Senior C++ developer with 7 years of experience building trading systems and low-latency services"
+    cache.add("summary", summary, "Seasoned C++ developer building low-latency trading systems.")
+    assert cache.lookup("summary", summary.replace("C++", "C#")) is None
+
+
+def test_rejects_dotnet_for_net():
+    cache = SimilarityCache(threshold=0.85)
+    skills = SKILLS + ", .NET"
+    cache.add("skills", skills, skills)
+    assert cache.lookup("skills", SKILLS + ", NET") is None
@@ -0,0 +1,17 @@
+from skills_engine import normalize_skills
+
+
+def test_aliases_keep_the_named_skill():
+    for item, expected in [("angularjs", "AngularJS"), ("six sigma", "Six Sigma"), ("algorithms", "Algorithms"),
+                           ("social media", "Social Media"), ("advanced excel", "Advanced Excel"),
+                           ("html", "HTML"), ("css", "CSS"), ("etl", "ETL")]:
+        assert normalize_skills(item)[0] == expected
+
+
+def test_same_skill_spellings_are_canonicalized():
+    assert normalize_skills("golang, k8s, nodejs")[0] == "Go, Kubernetes, Node.js"
+
+
+def test_casing_keeps_acronyms():
+    assert normalize_skills("excel vba")[0] == "Excel vba"
+    assert normalize_skills("etl pipelines")[0] == "ETL Pipelines"
@@ -0,0 +1,26 @@
+import os
+
+from docx import Document
+
+from structured_output import render
+
+os.environ["GROQ_API_KEY"] = ""
+os.environ["JOURNAL_ENABLED"] = "0"
+
+EXPERIENCE = {"roles": [
+    {"heading": "Engineer - Acme (2020 - Present)", "bullets": ["Led team of 5", "Cut costs 20%"]},
+    {"heading": "Intern - Initech (2019)", "bullets": ["Built CI pipeline"]},
+]}
+
+
+def test_experience_renders_heading_and_bullets_as_separate_docx_paragraphs(tmp_path, monkeypatch):
+    import app
+
+    monkeypatch.chdir(tmp_path)
+    path = app.create_enhanced_docx({"Work Experience": render("experience", EXPERIENCE)}, "experience.docx")
+    paragraphs = [p.text for p in Document(path).paragraphs]
+
+    assert "Engineer - Acme (2020 - Present)" in paragraphs
+    assert "- Led team of 5\n- Cut costs 20%" in paragraphs
+    assert "Intern - Initech (2019)" in paragraphs
+    assert "- Built CI pipeline" in paragraphs
@@ -0,0 +1,107 @@
+"""Linear-time text normalization for prompts, model replies and DOCX paragraphs.
+
+Replaces the chains of uncompiled whole-text regex substitutions formerly used
+by sanitize_input, clean_ai_response and format_for_docx with one precompiled
+pass per stage. Every pattern is anchored at a line start or made of disjoint
+character classes, and the lazy '.*?' scans cannot cross a newline, so no match
+backtracks beyond its own line and worst-case time is linear in the input.
+
+Preambles are stripped from all lines by one chained pattern. Only text where
+a preamble empties a whole line takes the old sequential passes (compiled), as
+that line's trailing whitespace then runs on into the lines after it.
+
+Output is identical to the previous regex implementations, including how a
+removed preamble's trailing whitespace swallowed the following blank lines and
+the next line's indentation (see bench_text.py, which checks this against the
+old code on a golden corpus and random inputs).
+"""
+import re
+
+# An opening ```lang with the whitespace after it, or a closing ``` at a line end. The
+# classes are disjoint, so a match never backtracks and the substitution is one pass.
+_FENCE = re.compile(r"^```\w*\s*|```$", re.MULTILINE)
+
+# The old preamble patterns, in the order they are applied
+_PREAMBLES = (
+    r"(?:Here's|Here is|Enhanced version:|Enhanced:|Sure,?.*?:)",
+    r"(?:Certainly|Of course|Absolutely).*?:",
+    r"\*\*.*?\*\*",
+)
+_SPACE = r"[^\S\n]*"
+# All of them chained over one line; the same as the sequential passes unless a pass empties a line
+_PREAMBLE_RUN = re.compile(
+    "^(?:" + "|".join(
+        _PREAMBLES[k] + _SPACE + "".join(f"(?:{p}{_SPACE})?" for p in _PREAMBLES[k + 1:])
+        for k in range(len(_PREAMBLES))
+    ) + ")",
+    re.IGNORECASE | re.MULTILINE
+)
+# The sequential passes, whose trailing whitespace runs across lines
+_PREAMBLE_PASSES = tuple(re.compile(f"^{p}\\s*", re.IGNORECASE | re.MULTILINE) for p in _PREAMBLES)
+_MARK = '\x00'
+
+# A blank-line run (first to last newline of the whitespace between paragraphs) or ---
+_PARAGRAPH_BREAK = re.compile(r"\n(?:[^\S\n]*\n)+|---")
+
+_QUOTES = ('"', "'")
+_BULLETS = ('•', '-')
+
+
+def collapse_whitespace(text):
+    """Collapse every whitespace run to one space and strip the ends."""
+    return ' '.join(text.split())
+
+
+def _strip_preambles(text):
+    """Strip preambles from every line in one pass, falling back to the sequential passes if a line empties."""
+    if _MARK not in text:
+        # Mark each stripped line start, so a line the preambles emptied shows up as a bare mark
+        marked = _PREAMBLE_RUN.sub(_MARK, text)
+        if not (marked == _MARK or marked.startswith(_MARK + '\n') or marked.endswith('\n' + _MARK)
+                or f'\n{_MARK}\n' in marked):
+            return marked.replace(_MARK, '')
+
+    # An emptied line's trailing whitespace ran on into the following lines
+    for pattern in _PREAMBLE_PASSES:
+        text = pattern.sub('', text)
+    return text
+
+
+def clean_response(text):
+    """Remove code fences, stock preambles and wrapping quotes from a model reply."""
+    if not text:
+        return ""
+
+    text = _FENCE.sub('', text).strip()
+    text = _strip_preambles(text).strip()
+
+    if text[:1] in _QUOTES:
+        text = text[1:]
+    if text[-1:] in _QUOTES:
+        text = text[:-1]
+    return text.strip()
+
+
+def docx_paragraphs(text):
+    """Split text into DOCX paragraphs on blank lines and '---', keeping bullet lists intact."""
+    if not text:
+        return
+
+    text = text.strip()
+
+    # Handle comma-separated lists (skills)
+    if ',' in text and '\n' not in text and len(text.split(',')) > 2:
+        yield text
+        return
+
+    for block in _PARAGRAPH_BREAK.split(text):
+        lines = [ln for ln in map(str.strip, block.splitlines()) if ln]
+        if not lines:
+            continue
+
+        # Check if it's a bullet list
+        is_list = all(ln[:1] in _BULLETS and ln[1:2].isspace() for ln in lines)
+        if is_list and len(lines) > 1:
+            yield '\n'.join(lines)
+        else:
+            yield ' '.join(lines)
@@ -0,0 +1,98 @@
+"""Local token counting, token-budget truncation and per-call usage accounting.
+
+Uses tiktoken's cl100k_base encoding when its vocabulary is available, and
+otherwise a regex approximation of BPE pieces (short letter runs, digit groups,
+single punctuation marks). Either way the counts are approximate: GROQ_MODEL is
+a Llama 4 model with its own tokenizer, which is not published in a form that
+can be loaded offline. They are used only to cap input size; billed usage comes
+from the provider's reported counts (TokenUsage).
+"""
+import logging
+import re
+import threading
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+_APPROX_TOKEN = re.compile(r" ?[A-Za-z]{1,6}| ?\d{1,3}| ?[^\sA-Za-z\d]|\s+")
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                if tiktoken is not None:
+                    try:
+                        _encoding = tiktoken.get_encoding("cl100k_base")
+                    except Exception as e:
+                        logger.warning(f"tiktoken unavailable, using approximate token counts: {e}")
+                _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text):
+    """Number of tokens in text."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return sum(1 for _ in _APPROX_TOKEN.finditer(text))
+
+
+def truncate_to_tokens(text, max_tokens):
+    """Cut text to at most max_tokens, backing off to the last word boundary."""
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        cut = encoding.decode(tokens[:max_tokens])
+    else:
+        for i, match in enumerate(_APPROX_TOKEN.finditer(text)):
+            if i == max_tokens:
+                cut = text[:match.start()]
+                break
+        else:
+            return text
+    return cut.rsplit(' ', 1)[0] if ' ' in cut else cut
+
+
+class TokenUsage:
+    """Running totals of provider-reported token usage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'cached_prompt_tokens': 0}
+
+    def record(self, response):
+        """Add one response's usage; return (prompt_tokens, completion_tokens)."""
+        usage = getattr(response, "usage", None)
+        prompt = getattr(usage, "prompt_tokens", 0) or 0
+        completion = getattr(usage, "completion_tokens", 0) or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", 0) or 0
+        with self._lock:
+            self._stats['calls'] += 1
+            self._stats['prompt_tokens'] += prompt
+            self._stats['completion_tokens'] += completion
+            self._stats['cached_prompt_tokens'] += cached
+        return prompt, completion
+
+    def stats(self):
+        """Totals and per-call averages, for /health."""
+        with self._lock:
+            stats = dict(self._stats)
+        calls = stats['calls'] or 1
+        stats['avg_prompt_tokens'] = round(stats['prompt_tokens'] / calls, 1)
+        stats['avg_completion_tokens'] = round(stats['completion_tokens'] / calls, 1)
+        return stats